@@ -1,15 +1,12 @@
 # app/api/routes_sentiment.py
 
 from datetime import date
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
-from app.services.market_data_service import fetch_prices_for_tickers
-from app.services.feature_service import add_price_features
-from app.services.training_frame_service import build_training_frame
-from app.services import model_service
+from app.services import predict_batcher, training_service
 
 router = APIRouter()
 
@@ -22,26 +19,66 @@ class TrainRequest(BaseModel):
     start_date: date
     end_date: date
 
+    @model_validator(mode="after")
+    def _normalize_tickers(self) -> "TrainRequest":
+        """
+        Merge `ticker` into `tickers`, then strip, uppercase, drop empties and
+        de-duplicate (keeping first-seen order). An empty result is left for
+        the endpoint to reject with a 400.
+        """
+        raw = ([self.ticker] if self.ticker else []) + (self.tickers or [])
+        cleaned = (t.strip().upper() for t in raw)
+        self.tickers = list(dict.fromkeys(t for t in cleaned if t))
+        return self
+
 
 class PredictRequest(BaseModel):
     ticker: str
 
 
-# ---------- /model/train ----------
+# ---------- Response models ----------
+# Declared response types put the bodies in the OpenAPI schema, and FastAPI
+# serializes them straight to JSON bytes with Pydantic (no jsonable_encoder /
+# json.dumps round trip), which is what replaces ORJSONResponse.
+
+class TrainResponse(BaseModel):
+    message: str
+    tickers: List[str]
+    effective_start_date: date
+    end_date: date
+    train_rows: int
+    price_rows: int
+    roc_auc: Optional[float] = None
+    warning: Optional[str] = None
+
+
+JobStatus = Literal["queued", "running", "completed", "failed"]
+
+
+class TrainJobAccepted(BaseModel):
+    job_id: str
+    status: JobStatus
 
-@router.post("/model/train")
-def train_endpoint(body: TrainRequest):
-    # ---- 1. Normalize tickers ----
-    tickers: List[str] = []
 
-    if body.ticker:
-        tickers.append(body.ticker)
-    if body.tickers:
-        tickers.extend([t for t in body.tickers if t])
+class TrainJobStatus(TrainJobAccepted):
+    result: Optional[TrainResponse] = None
+    error: Optional[str] = None
 
-    # remove duplicates / empties, uppercase
-    tickers = [t for t in {t.strip().upper() for t in tickers if t.strip()}]
 
+class PredictResponse(BaseModel):
+    ticker: str
+    prob_up: float
+
+
+# ---------- /model/train ----------
+
+def _validated_tickers(body: TrainRequest) -> List[str]:
+    """
+    Check that a train request has tickers and a usable date range.
+    Raises HTTPException(400) on invalid input.
+    """
+    # ---- 1. Tickers (already normalized by TrainRequest) ----
+    tickers = body.tickers
     if not tickers:
         raise HTTPException(
             status_code=400,
@@ -62,67 +99,64 @@ def train_endpoint(body: TrainRequest):
             detail="Not enough rows to train a model (n=1). Need at least 2.",
         )
 
-    # ---- 3. Fetch prices ----
-    prices = fetch_prices_for_tickers(
-        tickers=tickers,
-        start=body.start_date,
-        end=body.end_date,
-    )
-    if prices is None or prices.empty:
-        raise HTTPException(
-            status_code=400,
-            detail="No price data returned for given tickers and date range",
-        )
+    return tickers
 
-    # ---- 4. Feature engineering ----
-    prices_with_features = add_price_features(prices)
 
-    # ---- 5. Build training frame ----
+# Deliberately sync: fetching + training block, so FastAPI runs this in its
+# threadpool. The other handlers only touch memory and run on the event loop.
+@router.post("/model/train")
+def train_endpoint(body: TrainRequest) -> TrainResponse:
+    tickers = _validated_tickers(body)
+
     try:
-        train_df = build_training_frame(prices_with_features)
+        result = training_service.run_training(tickers, body.start_date, body.end_date)
     except ValueError as e:
-        # e.g. missing columns, no usable rows, etc.
+        # e.g. no price data, missing columns, not enough rows, etc.
         raise HTTPException(status_code=400, detail=str(e))
+    return TrainResponse.model_validate(result)
 
-    if len(train_df) < 2:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Not enough rows to train a model (n={len(train_df)}). Need at least 2.",
-        )
 
-    # ---- 6. Train model (maps into global state used by /predict-next) ----
-    try:
-        metrics = model_service.train_model(train_df)
-    except ValueError as e:
-        # e.g. no feature columns, no non-null target_up, etc.
-        raise HTTPException(status_code=400, detail=str(e))
+@router.post("/model/train/jobs", status_code=202)
+async def submit_train_job_endpoint(body: TrainRequest) -> TrainJobAccepted:
+    """
+    Same input as /model/train, but training runs on a background worker.
+    Returns 202 with a job_id to poll at /model/train/status/{job_id}.
+    """
+    tickers = _validated_tickers(body)
+    job = training_service.submit_training_job(
+        tickers, body.start_date, body.end_date
+    )
+    return TrainJobAccepted(job_id=job["job_id"], status=job["status"])
 
-    # ---- 7. Response (tests look for train_rows + roc_auc) ----
-    return {
-        "message": "Training completed",
-        "tickers": tickers,
-        "effective_start_date": body.start_date.isoformat(),
-        "end_date": body.end_date.isoformat(),
-        "train_rows": int(len(train_df)),
-        "price_rows": int(len(prices)),
-        "roc_auc": metrics.get("roc_auc"),
-        "warning": None,
-    }
+
+@router.get("/model/train/status/{job_id}")
+async def train_job_status_endpoint(job_id: str) -> TrainJobStatus:
+    """
+    Status of a background training job: queued | running | completed | failed.
+    `result` holds the /model/train response once completed, `error` the
+    failure message otherwise.
+    """
+    job = training_service.get_training_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown training job '{job_id}'")
+    return TrainJobStatus.model_validate(job)
 
 
 # ---------- /model/predict-next ----------
 
 @router.post("/model/predict-next")
-def predict_next_endpoint(body: PredictRequest):
+async def predict_next_endpoint(body: PredictRequest) -> PredictResponse:
     """
     P endpoints in tests:
       - P1: after training -> 200, prob_up in [0,1]
       - P2: without training -> 400 with proper error
       - P3: unknown ticker -> 400 with proper error
       - P4: bad body -> 422 (handled by Pydantic before here)
+
+    Concurrent requests are micro-batched into one predict_proba call.
     """
     try:
-        prob_up = model_service.predict_next(body.ticker)
+        prob_up = await predict_batcher.predict_next(body.ticker)
     except RuntimeError as e:
         # model not trained yet
         raise HTTPException(status_code=400, detail=str(e))
@@ -130,7 +164,4 @@ def predict_next_endpoint(body: PredictRequest):
         # unknown ticker or bad training frame
         raise HTTPException(status_code=400, detail=str(e))
 
-    return {
-        "ticker": body.ticker,
-        "prob_up": prob_up,
-    }
\ No newline at end of file
+    return PredictResponse(ticker=body.ticker, prob_up=prob_up)
\ No newline at end of file
@@ -1,6 +1,8 @@
 # app/api/routes_symbols.py
 
+import orjson
 from fastapi import APIRouter
+from fastapi.responses import Response
 
 router = APIRouter()
 
@@ -17,10 +19,13 @@ POPULAR_STOCKS = [
     {"symbol": "BAC", "name": "Bank of America Corporation"},
 ]
 
+# The list never changes, so serialize it once at import time
+_POPULAR_STOCKS_JSON = orjson.dumps(POPULAR_STOCKS)
+
 
 @router.get("/stocks/popular")
-def get_popular_stocks():
+async def get_popular_stocks():
     """
     S1: Return a static list of popular stocks (symbol + name).
     """
-    return POPULAR_STOCKS
\ No newline at end of file
+    return Response(content=_POPULAR_STOCKS_JSON, media_type="application/json")
\ No newline at end of file
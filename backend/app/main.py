@@ -1,12 +1,28 @@
 # app/main.py
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes_sentiment import router as sentiment_router
 from app.api.routes_symbols import router as symbols_router  # now this file exists
+from app.services import model_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Serve the last persisted model right away; loading it blocks, so do it
+    # in a thread rather than on the first /predict-next
+    await asyncio.to_thread(model_service.load_persisted_model)
+    yield
 
-app = FastAPI(title="Stock Sentiment Platform API")
+
+app = FastAPI(
+    title="Stock Sentiment Platform API",
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,7 +34,7 @@ app.add_middleware(
 
 
 @app.get("/")
-def root():
+async def root():
     return {"status": "ok", "message": "Stock Sentiment API"}
 
 
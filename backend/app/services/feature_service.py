@@ -2,72 +2,80 @@
 
 from __future__ import annotations
 
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 
 import numpy as np
 import pandas as pd
+from numba import njit
 from pandas import DataFrame
 
 
-def _feat_group(g: DataFrame) -> DataFrame:
+@njit(cache=True)
+def _grouped_rolling_moments(
+    values: np.ndarray, group_ends: np.ndarray, window: int
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Per-ticker feature engineering on price data.
-
-    Expects columns:
-      - date (datetime-like)
-      - Close
-      - Volume or volume
-
-    Produces:
-      - ret_1d, ret_5d
-      - vol_5d, vol_21d  (rolling std of 1-day returns)
-      - volume_z         (21-day z-score of volume, optional)
-      - day_of_week      (0=Monday..6=Sunday)
+    Rolling mean and sample std (ddof=1), min_periods=1, over contiguous
+    groups in one O(n) pass. Running mean / sum of squared deviations are
+    updated as each value enters and leaves the window (Welford), NaNs are
+    skipped, and the std needs two observations - same semantics as pandas,
+    including an exact 0 std for windows of identical values.
     """
-    g = g.sort_values("date").copy()
-
-    # Ensure datetime
-    g["date"] = pd.to_datetime(g["date"])
-
-    # --- Close price as a 1-D Series ---
-    close = g["Close"]
-    if isinstance(close, pd.DataFrame):
-        close = close.iloc[:, 0]
-    close = close.astype(float)
-
-    # --- Returns ---
-    ret_1d = close.pct_change(periods=1, fill_method=None)
-    ret_5d = close.pct_change(periods=5, fill_method=None)
-
-    g["ret_1d"] = ret_1d
-    g["ret_5d"] = ret_5d
-
-    # --- Rolling volatility of 1-day returns ---
-    g["vol_5d"] = ret_1d.rolling(window=5, min_periods=1).std()
-    g["vol_21d"] = ret_1d.rolling(window=21, min_periods=1).std()
-
-    # --- Volume-based features (optional but nice) ---
-    vol_col: Optional[str] = None
-    if "Volume" in g.columns:
-        vol_col = "Volume"
-    elif "volume" in g.columns:
-        vol_col = "volume"
-
-    if vol_col is not None:
-        vol = g[vol_col].astype(float)
-        vol_mean_21 = vol.rolling(window=21, min_periods=1).mean()
-        vol_std_21 = vol.rolling(window=21, min_periods=1).std()
-
-        volume_z = (vol - vol_mean_21) / vol_std_21
-        volume_z = volume_z.replace([np.inf, -np.inf], np.nan).fillna(0.0)
-        g["volume_z"] = volume_z
-    else:
-        g["volume_z"] = np.nan
-
-    # --- Calendar feature ---
-    g["day_of_week"] = g["date"].dt.dayofweek
-
-    return g
+    n = values.shape[0]
+    out_mean = np.full(n, np.nan)
+    out_std = np.full(n, np.nan)
+
+    start = 0
+    for g in range(group_ends.shape[0]):
+        end = group_ends[g]
+        nobs = 0
+        mean = 0.0
+        ssqdm = 0.0
+        prev = np.nan
+        n_same = 0
+
+        for i in range(start, end):
+            x = values[i]
+            if not np.isnan(x):
+                nobs += 1
+                delta = x - mean
+                mean += delta / nobs
+                ssqdm += delta * (x - mean)
+                n_same = n_same + 1 if x == prev else 1
+                prev = x
+
+            j = i - window
+            if j >= start:
+                y = values[j]
+                if not np.isnan(y):
+                    nobs -= 1
+                    if nobs > 0:
+                        delta = y - mean
+                        mean -= delta / nobs
+                        ssqdm -= delta * (y - mean)
+                    else:
+                        mean = 0.0
+                        ssqdm = 0.0
+
+            if nobs >= 1:
+                out_mean[i] = mean
+            if nobs >= 2:
+                if n_same >= nobs:
+                    out_std[i] = 0.0
+                else:
+                    var = ssqdm / (nobs - 1)
+                    out_std[i] = np.sqrt(var) if var > 0.0 else 0.0
+
+        start = end
+
+    return out_mean, out_std
+
+
+def _group_ends(tickers: pd.Series) -> np.ndarray:
+    """End offsets of each contiguous ticker block in a frame sorted by ticker."""
+    t = tickers.to_numpy()
+    ends = np.flatnonzero(t[1:] != t[:-1]) + 1
+    return np.append(ends, len(t)).astype(np.int64)
 
 
 def _build_from_suffixed(
@@ -100,15 +108,24 @@ def _build_from_suffixed(
     if ticker_col not in df.columns:
         return None
 
-    # Create the unified column
-    col_name = base_name
-    df[col_name] = np.nan
-    tick_upper = df[ticker_col].astype(str).str.upper()
+    if df.empty:
+        return None
 
-    for t, src_col in mapping.items():
-        mask = tick_upper == t
-        if mask.any():
-            df.loc[mask, col_name] = df.loc[mask, src_col].astype(float)
+    # Create the unified column: stack one source column per distinct ticker
+    # (NaN where a ticker has no suffixed column) and gather each row's value
+    # from its own ticker's column in a single vectorized pass.
+    col_name = base_name
+    tick_upper = df[ticker_col].astype(str).str.upper().to_numpy()
+    uniq, inv = np.unique(tick_upper, return_inverse=True)
+
+    n = len(df)
+    stacked = np.column_stack(
+        [
+            df[mapping[t]].to_numpy(dtype=float) if t in mapping else np.full(n, np.nan)
+            for t in uniq
+        ]
+    )
+    df[col_name] = np.take_along_axis(stacked, inv.reshape(-1, 1), axis=1).ravel()
 
     # If everything is still NaN, treat as failure
     if df[col_name].isna().all():
@@ -134,16 +151,19 @@ def add_price_features(df: DataFrame) -> DataFrame:
       - 'Close'   (can be inferred from 'Close_<TICKER>')
       - 'Volume' or 'volume' (can be inferred from 'Volume_<TICKER>')
 
-    Returns the same rows, with extra feature columns:
+    Returns the same rows (sorted by ticker, date), with extra feature columns:
       - ret_1d, ret_5d
-      - vol_5d, vol_21d
-      - volume_z
-      - day_of_week
+      - vol_5d, vol_21d  (rolling std of 1-day returns)
+      - volume_z         (21-day z-score of volume)
+      - day_of_week      (0=Monday..6=Sunday)
     """
     if df is None or df.empty:
         raise ValueError("add_price_features: received empty price DataFrame")
 
-    df = df.copy()
+    # Shallow copy: we only relabel and add/replace whole columns below (and
+    # sort into a new frame), so the caller's data is never written to and
+    # there is no need to duplicate every OHLCV buffer up front.
+    df = df.copy(deep=False)
 
     # --- 1) Flatten MultiIndex columns if present ---
     if isinstance(df.columns, pd.MultiIndex):
@@ -191,21 +211,58 @@ def add_price_features(df: DataFrame) -> DataFrame:
 
     # --- 5) Try to ensure we have some volume column (Volume or volume) ---
     if "Volume" not in df.columns and "volume" not in df.columns:
-        # Try to build 'Volume' from 'Volume_<TICKER>'
-        vol_col = _build_from_suffixed(df, "Volume", ticker_col="ticker")
-        # It's okay if this returns None; _feat_group falls back to NaNs for volume_z
+        # Try to build 'Volume' from 'Volume_<TICKER>'. If there is none, the
+        # volume block below skips _grouped_rolling_moments and volume_z stays NaN.
+        _build_from_suffixed(df, "Volume", ticker_col="ticker")
+
+    # Ensure date is datetime (market_data_service already delivers datetime64)
+    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values(["ticker", "date"], ignore_index=True)
+
+    # --- 6) Per-ticker features, vectorized across all tickers at once ---
+    tickers = df["ticker"]
+
+    # Close price as a 1-D Series
+    close = df["Close"]
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
+    close = close.astype(float)
+
+    # Returns
+    by_ticker = close.groupby(tickers, sort=False)
+    ret_1d = by_ticker.pct_change(periods=1, fill_method=None)
+    df["ret_1d"] = ret_1d
+    df["ret_5d"] = by_ticker.pct_change(periods=5, fill_method=None)
+
+    # Rolling volatility of 1-day returns (single-pass numba kernel)
+    group_ends = _group_ends(tickers)
+    rets = ret_1d.to_numpy(dtype=np.float64)
+    df["vol_5d"] = _grouped_rolling_moments(rets, group_ends, 5)[1]
+    df["vol_21d"] = _grouped_rolling_moments(rets, group_ends, 21)[1]
 
-    # Ensure date is datetime and sort
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values(["ticker", "date"])
+    # Volume z-score over 21 days (NaN if there is no volume column)
+    vol_col: Optional[str] = None
+    if "Volume" in df.columns:
+        vol_col = "Volume"
+    elif "volume" in df.columns:
+        vol_col = "volume"
 
-    # --- 6) Group by ticker and apply per-ticker feature logic ---
-    df_feat = df.groupby("ticker", group_keys=False).apply(_feat_group)
+    if vol_col is not None:
+        vol = df[vol_col].astype(float)
+        vol_mean_21, vol_std_21 = _grouped_rolling_moments(
+            vol.to_numpy(dtype=np.float64), group_ends, 21
+        )
+
+        volume_z = (vol - vol_mean_21) / vol_std_21
+        df["volume_z"] = volume_z.replace([np.inf, -np.inf], np.nan).fillna(0.0)
+    else:
+        df["volume_z"] = np.nan
 
-    # Flatten any index weirdness
-    df_feat = df_feat.reset_index(drop=True)
+    # Calendar feature
+    df["day_of_week"] = df["date"].dt.dayofweek
 
     # Replace ±inf with NaN so later code can handle / drop them
-    df_feat.replace([np.inf, -np.inf], np.nan, inplace=True)
+    df.replace([np.inf, -np.inf], np.nan, inplace=True)
 
-    return df_feat
\ No newline at end of file
+    return df
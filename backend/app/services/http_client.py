@@ -0,0 +1,37 @@
+# app/services/http_client.py
+
+from __future__ import annotations
+
+import importlib.util
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+
+# HTTP/2 needs the optional `h2` package (httpx[http2]); fall back to HTTP/1.1
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+def _new_client() -> httpx.AsyncClient:
+    # retries here only cover connection failures, not HTTP status codes
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        http2=_HTTP2,
+        retries=2,
+    )
+    return httpx.AsyncClient(timeout=15, transport=transport)
+
+
+@asynccontextmanager
+async def client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Yield a pooled AsyncClient for one batch of outbound API calls, closed on
+    exit. Callers fan their requests out over it with asyncio.gather, so a
+    batch shares connections.
+
+    The fetchers run under asyncio.run from sync code (a fresh event loop per
+    call), and httpx clients can't be shared across event loops, so there is
+    no process-wide client.
+    """
+    async with _new_client() as c:
+        yield c
@@ -3,16 +3,31 @@
 from __future__ import annotations
 
 import logging
+import threading
 from datetime import date
-from typing import List
+from typing import List, Tuple
 
 import pandas as pd
 import yfinance as yf
+from cachetools import TTLCache
 
-from app.services.marketstack_service import fetch_marketstack_for_tickers
+from app.services.marketstack_service import (
+    fetch_marketstack_for_tickers,
+    stack_price_frames,
+)
 
 logger = logging.getLogger(__name__)
 
+# Normalized per-ticker yfinance frames keyed on (ticker, start, end).
+# Retraining the same window is common while experimenting, so repeat
+# fetches are served from memory instead of the network.
+_PRICE_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+_PRICE_CACHE_LOCK = threading.Lock()
+
+
+def _cache_key(ticker: str, start: date, end: date) -> Tuple[str, str, str]:
+    return (ticker, start.isoformat(), end.isoformat())
+
 
 def _empty_price_df() -> pd.DataFrame:
     return pd.DataFrame(
@@ -20,61 +35,117 @@ def _empty_price_df() -> pd.DataFrame:
     )
 
 
+def _normalize_yf_frame(df_yf: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """
+    Turn one ticker's slice of a yfinance download (Date index, OHLCV columns)
+    into the long format used by the rest of the pipeline.
+    """
+    df_yf = df_yf.dropna(subset=["Close"]).rename_axis(columns=None).reset_index()
+    df_yf.rename(
+        columns={
+            "Date": "date",
+            "Open": "Open",
+            "High": "High",
+            "Low": "Low",
+            "Close": "Close",
+            "Adj Close": "AdjClose",
+            "Volume": "Volume",
+        },
+        inplace=True,
+    )
+
+    # Keep datetime64 (not python date objects) so downstream date ops stay
+    # vectorized; this is the only place the date column gets converted.
+    df_yf["date"] = pd.to_datetime(df_yf["date"])
+    df_yf["ticker"] = ticker
+
+    return df_yf[["ticker", "date", "Open", "High", "Low", "Close", "Volume"]]
+
+
+def _download_yf(tickers: List[str], start: date, end: date) -> List[pd.DataFrame]:
+    """
+    Download tickers from yfinance in one batched call and return one
+    normalized frame per ticker that had data. Results are cached.
+    """
+    logger.info("Fetching prices for %s from yfinance", tickers)
+    df_yf = yf.download(
+        tickers,
+        start=start.isoformat(),
+        end=end.isoformat(),
+        group_by="ticker",
+        auto_adjust=True,
+        threads=True,
+        progress=False,
+    )
+    if df_yf is None or df_yf.empty:
+        return []
+
+    frames: List[pd.DataFrame] = []
+    for ticker in tickers:
+        # group_by="ticker" gives (Ticker, Price) columns; older yfinance
+        # versions return flat columns for a single ticker.
+        if isinstance(df_yf.columns, pd.MultiIndex):
+            if ticker not in df_yf.columns.get_level_values(0):
+                continue
+            df_t = df_yf[ticker]
+        else:
+            df_t = df_yf
+
+        df_t = _normalize_yf_frame(df_t, ticker)
+        if df_t.empty:
+            continue
+
+        with _PRICE_CACHE_LOCK:
+            _PRICE_CACHE[_cache_key(ticker, start, end)] = df_t.copy(deep=True)
+        frames.append(df_t)
+
+    return frames
+
+
 def fetch_prices_for_tickers(
     tickers: List[str], start: date, end: date
 ) -> pd.DataFrame:
     """
     Fetch daily OHLCV prices for the given tickers between start and end.
 
-    Primary source: yfinance
-    Fallback: Marketstack (if yfinance returns no data for a ticker)
+    Primary source: yfinance, queried once for all uncached tickers (batch mode)
+    Fallback: Marketstack (for tickers missing from the yfinance result)
 
     Returns columns: ticker, date, Open, High, Low, Close, Volume
     """
-    frames: List[pd.DataFrame] = []
-
-    for ticker in tickers:
-        logger.info("Fetching prices for %s from yfinance", ticker)
-        df_yf = yf.download(
-            ticker,
-            start=start.isoformat(),
-            end=end.isoformat(),
-        )
-
-        if df_yf is None or df_yf.empty:
-            logger.warning("No yfinance data for %s, trying Marketstack", ticker)
-            frames.append(
-                fetch_marketstack_for_tickers([ticker], start=start, end=end)
-            )
-            continue
+    if not tickers:
+        return _empty_price_df()
 
-        df_yf = df_yf.reset_index()
-        df_yf.rename(
-            columns={
-                "Date": "date",
-                "Open": "Open",
-                "High": "High",
-                "Low": "Low",
-                "Close": "Close",
-                "Adj Close": "AdjClose",
-                "Volume": "Volume",
-            },
-            inplace=True,
-        )
-
-        df_yf["date"] = pd.to_datetime(df_yf["date"]).dt.date
-        df_yf["ticker"] = ticker
-
-        frames.append(
-            df_yf[["ticker", "date", "Open", "High", "Low", "Close", "Volume"]]
-        )
-
-    frames = [f for f in frames if not f.empty]
-    if not frames:
+    frames: List[pd.DataFrame] = []
+    to_download: List[str] = []
+
+    with _PRICE_CACHE_LOCK:
+        for ticker in tickers:
+            cached = _PRICE_CACHE.get(_cache_key(ticker, start, end))
+            if cached is None:
+                to_download.append(ticker)
+            else:
+                # copy so downstream mutation can't poison the cache
+                frames.append(cached.copy())
+
+    downloaded: List[pd.DataFrame] = []
+    if to_download:
+        downloaded = _download_yf(to_download, start, end)
+        frames.extend(downloaded)
+    else:
+        logger.info("Prices for %s served from cache", tickers)
+
+    found = {f["ticker"].iat[0] for f in downloaded}
+    missing = [t for t in to_download if t not in found]
+    if missing:
+        logger.warning("No yfinance data for %s, trying Marketstack", missing)
+        frames.append(fetch_marketstack_for_tickers(missing, start=start, end=end))
+
+    df_all = stack_price_frames(frames)
+    if df_all.empty:
         logger.warning("fetch_prices_for_tickers: no data for %s", tickers)
         return _empty_price_df()
 
-    df_all = pd.concat(frames, ignore_index=True)
     df_all = df_all.sort_values(["ticker", "date"])
     logger.info(
         "Combined price frame: rows=%d, cols=%d", df_all.shape[0], df_all.shape[1]
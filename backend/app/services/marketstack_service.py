@@ -2,35 +2,80 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+import threading
 from datetime import date
-from typing import List
+from typing import List, Optional, Tuple
 
+import httpx
+import numpy as np
+import orjson
 import pandas as pd
-import requests
+from cachetools import TTLCache
+
+from app.services import http_client
 
 logger = logging.getLogger(__name__)
 
 MARKETSTACK_API_KEY = os.getenv("MARKETSTACK_API_KEY")
 MARKETSTACK_BASE_URL = "http://api.marketstack.com/v1/eod"
 
+# Non-empty responses keyed on (ticker, start, end)
+_MARKETSTACK_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+_MARKETSTACK_CACHE_LOCK = threading.Lock()
+
+
+PRICE_COLUMNS = ["ticker", "date", "Open", "High", "Low", "Close", "Volume"]
+
 
 def _empty_price_df() -> pd.DataFrame:
-    return pd.DataFrame(
-        columns=["ticker", "date", "Open", "High", "Low", "Close", "Volume"]
-    )
+    return pd.DataFrame(columns=PRICE_COLUMNS)
 
 
-def fetch_marketstack_for_ticker(ticker: str, start: date, end: date) -> pd.DataFrame:
+def stack_price_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
     """
-    Fetch EOD prices for a single ticker from Marketstack.
-    Returns columns: ticker, date, Open, High, Low, Close, Volume
+    Stack per-ticker price frames (PRICE_COLUMNS) into one frame.
+
+    Equivalent to pd.concat(frames, ignore_index=True), but each output column
+    is allocated once at its final size and filled slice by slice, so there
+    are no intermediate per-frame blocks to consolidate afterwards.
     """
-    if not MARKETSTACK_API_KEY:
-        logger.warning("MARKETSTACK_API_KEY not set; skipping Marketstack fetch.")
+    frames = [f for f in frames if not f.empty]
+    if not frames:
         return _empty_price_df()
 
+    total = sum(len(f) for f in frames)
+    out = {}
+    for col in PRICE_COLUMNS:
+        dtypes = [f[col].dtype for f in frames]
+        if all(isinstance(dt, np.dtype) and dt != object for dt in dtypes):
+            dtype = np.result_type(*dtypes)
+        else:
+            dtype = np.dtype(object)
+
+        buf = np.empty(total, dtype=dtype)
+        offset = 0
+        for f in frames:
+            buf[offset : offset + len(f)] = f[col].to_numpy(dtype=dtype)
+            offset += len(f)
+        out[col] = buf
+
+    return pd.DataFrame(out)
+
+
+def _cache_key(ticker: str, start: date, end: date) -> Tuple[str, str, str]:
+    return (ticker, start.isoformat(), end.isoformat())
+
+
+async def _fetch_marketstack_async(
+    client: httpx.AsyncClient, ticker: str, start: date, end: date
+) -> pd.DataFrame:
+    """
+    Fetch EOD prices for a single ticker from Marketstack over the batch's client.
+    Returns columns: ticker, date, Open, High, Low, Close, Volume
+    """
     params = {
         "access_key": MARKETSTACK_API_KEY,
         "symbols": ticker,
@@ -40,7 +85,7 @@ def fetch_marketstack_for_ticker(ticker: str, start: date, end: date) -> pd.Data
     }
 
     try:
-        resp = requests.get(MARKETSTACK_BASE_URL, params=params, timeout=10)
+        resp = await client.get(MARKETSTACK_BASE_URL, params=params)
     except Exception as exc:
         logger.error("Marketstack request failed for %s: %s", ticker, exc)
         return _empty_price_df()
@@ -54,20 +99,19 @@ def fetch_marketstack_for_ticker(ticker: str, start: date, end: date) -> pd.Data
         )
         return _empty_price_df()
 
-    data = resp.json()
+    try:
+        data = orjson.loads(resp.content)
+    except orjson.JSONDecodeError as exc:
+        logger.error("Marketstack returned invalid JSON for %s: %s", ticker, exc)
+        return _empty_price_df()
     rows = data.get("data", [])
     records = []
 
     for row in rows:
-        try:
-            d = pd.to_datetime(row["date"]).date()
-        except Exception:
-            continue
-
         records.append(
             {
                 "ticker": ticker,
-                "date": d,
+                "date": row.get("date"),
                 "Open": row.get("open"),
                 "High": row.get("high"),
                 "Low": row.get("low"),
@@ -80,16 +124,86 @@ def fetch_marketstack_for_ticker(ticker: str, start: date, end: date) -> pd.Data
     if df.empty:
         return _empty_price_df()
 
+    # One vectorized parse to naive datetime64; unparsable dates are dropped
+    dates = pd.to_datetime(df["date"], utc=True, errors="coerce")
+    df["date"] = dates.dt.tz_localize(None)
+    df = df.dropna(subset=["date"])
+    if df.empty:
+        return _empty_price_df()
+
     df = df.sort_values("date")
     logger.info("Marketstack rows for %s: %d", ticker, len(df))
     return df
 
 
+async def fetch_marketstack_many(
+    tickers: List[str], start: date, end: date
+) -> List[pd.DataFrame]:
+    """
+    Fetch EOD prices for several tickers from Marketstack, concurrently over
+    one pooled client. Non-empty results are cached per (ticker, start, end).
+
+    Returns one frame per ticker, in order (empty where Marketstack had no
+    data or the request failed), with columns
+    ticker, date, Open, High, Low, Close, Volume
+    """
+    if not MARKETSTACK_API_KEY:
+        logger.warning("MARKETSTACK_API_KEY not set; skipping Marketstack fetch.")
+        return [_empty_price_df() for _ in tickers]
+
+    frames: List[Optional[pd.DataFrame]] = []
+    with _MARKETSTACK_CACHE_LOCK:
+        for t in tickers:
+            cached = _MARKETSTACK_CACHE.get(_cache_key(t, start, end))
+            frames.append(None if cached is None else cached.copy())
+
+    to_fetch = [t for t, f in zip(tickers, frames) if f is None]
+    if not to_fetch:
+        return frames
+
+    async with http_client.client() as client:
+        results = await asyncio.gather(
+            *[_fetch_marketstack_async(client, t, start, end) for t in to_fetch],
+            return_exceptions=True,
+        )
+
+    fetched = {}
+    for t, res in zip(to_fetch, results):
+        if isinstance(res, BaseException):
+            logger.error("Marketstack fetch failed for %s: %s", t, res, exc_info=res)
+            res = _empty_price_df()
+        fetched[t] = res
+
+    with _MARKETSTACK_CACHE_LOCK:
+        for t, df in fetched.items():
+            if not df.empty:
+                _MARKETSTACK_CACHE[_cache_key(t, start, end)] = df.copy(deep=True)
+
+    return [fetched[t] if f is None else f for t, f in zip(tickers, frames)]
+
+
 def fetch_marketstack_for_tickers(
     tickers: List[str], start: date, end: date
 ) -> pd.DataFrame:
-    frames = [fetch_marketstack_for_ticker(t, start, end) for t in tickers]
-    frames = [f for f in frames if not f.empty]
-    if not frames:
+    """
+    Fetch EOD prices for several tickers from Marketstack, concurrently.
+
+    Sync entry point (runs fetch_marketstack_many on its own event loop);
+    call it from sync code or a worker thread. Async code awaits
+    fetch_marketstack_many instead.
+
+    Returns columns: ticker, date, Open, High, Low, Close, Volume
+    """
+    if not MARKETSTACK_API_KEY:
+        logger.warning("MARKETSTACK_API_KEY not set; skipping Marketstack fetch.")
         return _empty_price_df()
-    return pd.concat(frames, ignore_index=True)
\ No newline at end of file
+
+    return stack_price_frames(asyncio.run(fetch_marketstack_many(tickers, start, end)))
+
+
+def fetch_marketstack_for_ticker(ticker: str, start: date, end: date) -> pd.DataFrame:
+    """
+    Fetch EOD prices for a single ticker from Marketstack.
+    Returns columns: ticker, date, Open, High, Low, Close, Volume
+    """
+    return fetch_marketstack_for_tickers([ticker], start, end)
@@ -7,6 +7,7 @@ import os
 from datetime import date
 from typing import List
 
+import orjson
 import pandas as pd
 import requests
 
@@ -57,7 +58,7 @@ def fetch_mediastack_for_ticker(ticker: str, start: date, end: date) -> pd.DataF
         )
         return _empty_df()
 
-    data = resp.json()
+    data = orjson.loads(resp.content)
     raw_articles = data.get("data", [])
     records = []
 
@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Tuple, Optional
+import os
+import tempfile
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Tuple, Optional
 
+import joblib
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import roc_auc_score
-from sklearn.model_selection import train_test_split
+
+if TYPE_CHECKING:
+    from sklearn.ensemble import RandomForestClassifier
 
 logger = logging.getLogger(__name__)
 
@@ -23,22 +28,119 @@ FEATURE_COLS: List[str] = [
     "day_of_week",
 ]
 
-# Global state used by the API/tests
-_GLOBAL_MODEL: Optional[Tuple[RandomForestClassifier, List[str]]] = None
+# Global state used by the API/tests.
+# (clf, feature_cols, last_rows), where last_rows maps ticker -> its latest
+# (1, n_features) float32 feature row. Training and loading run in worker
+# threads, so the three are published in one assignment and readers take the
+# tuple once: a model is never paired with another run's rows.
+_GLOBAL_MODEL: Optional[
+    Tuple[RandomForestClassifier, List[str], Dict[str, np.ndarray]]
+] = None
 _LAST_TRAIN_DF: Optional[pd.DataFrame] = None
 
+# Last trained (model, feature_cols, train_df) on disk, so restarted or sibling
+# uvicorn workers can predict without retraining. The default lives under the
+# backend's own directory, not the shared temp dir: load_persisted_model
+# unpickles this file, so nobody else may be able to create it.
+_BACKEND_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+MODEL_PATH = os.getenv(
+    "MODEL_PATH", os.path.join(_BACKEND_ROOT, "var", "stock_sentiment_model.joblib")
+)
 
-def _select_feature_cols(df: pd.DataFrame) -> List[str]:
+
+def _build_last_rows(df: pd.DataFrame, feature_cols: List[str]) -> Dict[str, np.ndarray]:
     """
-    Return the subset of FEATURE_COLS that are actually present in df.
-    Raises if none of the expected feature columns are available.
+    Precompute each ticker's latest feature row so predict_next is a dict
+    lookup instead of a filter + sort over the whole training frame.
+    """
+    if "ticker" not in df.columns:
+        raise ValueError("Training DataFrame does not contain 'ticker' column")
+    if "date" not in df.columns:
+        raise ValueError("Training DataFrame does not contain 'date' column")
+
+    last = df.sort_values("date").groupby("ticker", sort=False).tail(1)
+    X = last[feature_cols].fillna(0.0).to_numpy(dtype=np.float32)
+    return {t: X[i : i + 1] for i, t in enumerate(last["ticker"])}
+
+
+def _save_model(
+    clf: RandomForestClassifier, feature_cols: List[str], train_df: pd.DataFrame
+) -> None:
+    """
+    Persist one training run's (clf, feature_cols, train_df) to MODEL_PATH
+    (best effort). Takes the run's own values rather than the globals, which a
+    concurrent run may already have replaced.
     """
-    cols = [c for c in FEATURE_COLS if c in df.columns]
+    model_dir = os.path.dirname(MODEL_PATH)
+    tmp_path = None
+    try:
+        os.makedirs(model_dir, exist_ok=True)
+        # Unique temp file per call: the /model/train threadpool and the job
+        # worker can save concurrently in one process.
+        fd, tmp_path = tempfile.mkstemp(
+            dir=model_dir, prefix=os.path.basename(MODEL_PATH) + ".", suffix=".tmp"
+        )
+        os.close(fd)
+        # compress=0 keeps arrays raw so they can be memory-mapped on load;
+        # write-then-rename so readers never see a half-written file.
+        joblib.dump((clf, feature_cols, train_df), tmp_path, compress=0)
+        os.replace(tmp_path, MODEL_PATH)
+    except OSError as e:
+        logger.warning("Could not persist model to %s: %s", MODEL_PATH, e)
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_persisted_model() -> None:
+    """
+    Populate the globals from MODEL_PATH if a persisted model exists.
+
+    Blocking (disk read, unpickling, sklearn import): call it from a thread,
+    not the event loop.
+    """
+    global _GLOBAL_MODEL, _LAST_TRAIN_DF
+
+    if not os.path.exists(MODEL_PATH):
+        return
+    try:
+        clf, feature_cols, train_df = joblib.load(MODEL_PATH, mmap_mode="r")
+    except Exception as e:
+        logger.warning("Could not load persisted model from %s: %s", MODEL_PATH, e)
+        return
+
+    last_rows = _build_last_rows(train_df, feature_cols)
+    _GLOBAL_MODEL = (clf, feature_cols, last_rows)
+    _LAST_TRAIN_DF = train_df
+    # Not trained by this process: say which model is being served
+    logger.warning(
+        "Serving persisted model from %s (saved %s, tickers %s); retrain to replace it",
+        MODEL_PATH,
+        datetime.fromtimestamp(os.path.getmtime(MODEL_PATH)).isoformat(timespec="seconds"),
+        sorted(last_rows),
+    )
+
+
+@lru_cache(maxsize=8)
+def _select_feature_cols_cached(columns: FrozenSet[str]) -> Tuple[str, ...]:
+    cols = tuple(c for c in FEATURE_COLS if c in columns)
     if not cols:
         raise ValueError("No expected feature columns found in training DataFrame")
     return cols
 
 
+def _select_feature_cols(df: pd.DataFrame) -> List[str]:
+    """
+    Return the subset of FEATURE_COLS that are actually present in df.
+    Raises if none of the expected feature columns are available.
+
+    Memoized on the frame's column set, which is the same for every
+    training run of the standard pipeline.
+    """
+    return list(_select_feature_cols_cached(frozenset(df.columns)))
+
+
 def train_model(train_df: pd.DataFrame) -> Dict[str, Optional[float]]:
     """
     Train a RandomForest model on the given training frame.
@@ -49,12 +151,19 @@ def train_model(train_df: pd.DataFrame) -> Dict[str, Optional[float]]:
       - 'ticker' and 'date' may be present but are not used as features
 
     Side effects:
-      - sets _GLOBAL_MODEL to (clf, feature_cols)
+      - sets _GLOBAL_MODEL to (clf, feature_cols, each ticker's latest feature row)
       - sets _LAST_TRAIN_DF to the cleaned training DataFrame
+      - persists model + training frame to MODEL_PATH
 
     Returns:
       - dict with at least {"roc_auc": <float or None>}
     """
+    # sklearn is most of the app's import time; load it on first training
+    # (joblib.load imports it for persisted models) instead of at startup
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import roc_auc_score
+    from sklearn.model_selection import train_test_split
+
     global _GLOBAL_MODEL, _LAST_TRAIN_DF
 
     if train_df is None or train_df.empty:
@@ -73,14 +182,16 @@ def train_model(train_df: pd.DataFrame) -> Dict[str, Optional[float]]:
     if df.empty:
         raise ValueError("No rows with non-null target_up in training DataFrame")
 
-    df["target_up"] = df["target_up"].astype(int)
+    df["target_up"] = df["target_up"].astype(np.int8)
 
     # Select usable feature columns
     feature_cols = _select_feature_cols(df)
     logger.info("Using feature columns: %s", feature_cols)
 
-    X = df[feature_cols].fillna(0.0)
-    y = df["target_up"]
+    # Trees split on float32 internally; handing sklearn float32 up front
+    # skips its conversion copy and halves the bytes moved during fit.
+    X = df[feature_cols].fillna(0.0).to_numpy(dtype=np.float32, copy=False)
+    y = df["target_up"].to_numpy()
 
     n = len(df)
     if n < 20:
@@ -95,10 +206,14 @@ def train_model(train_df: pd.DataFrame) -> Dict[str, Optional[float]]:
         X, y, test_size=0.2, shuffle=False
     )
 
+    # Size the forest to the data: small windows don't benefit from 200 trees,
+    # and on large ones each tree only needs a bootstrap half of the rows.
+    n_train = len(X_train)
     clf = RandomForestClassifier(
-        n_estimators=200,
+        n_estimators=64 if n_train < 200 else 200,
         max_depth=6,
         min_samples_leaf=5,
+        max_samples=None if n_train < 1000 else 0.5,
         random_state=42,
         n_jobs=-1,
     )
@@ -117,45 +232,58 @@ def train_model(train_df: pd.DataFrame) -> Dict[str, Optional[float]]:
             unique_labels,
         )
 
-    _GLOBAL_MODEL = (clf, feature_cols)
+    _GLOBAL_MODEL = (clf, feature_cols, _build_last_rows(df, feature_cols))
     _LAST_TRAIN_DF = df
+    _save_model(clf, feature_cols, df)
 
     # Use None instead of NaN so JSON encoding doesn't break
     return {"roc_auc": roc_auc}
 
 
-def predict_next(ticker: str) -> float:
+def has_model() -> bool:
+    """True if this process holds a trained or loaded model in memory."""
+    return _GLOBAL_MODEL is not None
+
+
+def latest_feature_row(ticker: str) -> Tuple[RandomForestClassifier, np.ndarray]:
     """
-    Predict the probability that the next day's close for this ticker will be UP.
-    Uses the last trained model and the last available feature row for this ticker.
+    Return the trained model and the (1, n_features) float32 feature array
+    (last available date) for this ticker, ready for clf.predict_proba.
+
+    Falls back to the model persisted at MODEL_PATH if this process has not
+    trained one itself.
 
     Raises:
-      - RuntimeError if model was never trained
+      - RuntimeError if no model was trained (here or persisted)
       - ValueError if ticker not seen in training
     """
-    global _GLOBAL_MODEL, _LAST_TRAIN_DF
-
-    if _GLOBAL_MODEL is None or _LAST_TRAIN_DF is None:
+    state = _GLOBAL_MODEL
+    if state is None:
+        load_persisted_model()
+        state = _GLOBAL_MODEL
+    if state is None:
         raise RuntimeError("Model has not been trained yet in this process")
 
-    clf, feature_cols = _GLOBAL_MODEL
-    df = _LAST_TRAIN_DF
+    clf, _, last_rows = state
+    x = last_rows.get(ticker)
+    if x is None:
+        raise ValueError(f"No training samples found for ticker '{ticker}'")
 
-    if "ticker" not in df.columns:
-        raise ValueError("Training DataFrame does not contain 'ticker' column")
-    if "date" not in df.columns:
-        raise ValueError("Training DataFrame does not contain 'date' column")
+    return clf, x
 
-    df_t = df[df["ticker"] == ticker]
-    if df_t.empty:
-        raise ValueError(f"No training samples found for ticker '{ticker}'")
 
-    df_t = df_t.sort_values("date")
-    last_row = df_t.iloc[-1:]
+def predict_next(ticker: str) -> float:
+    """
+    Predict the probability that the next day's close for this ticker will be UP.
+    Uses the last trained model and the last available feature row for this ticker.
 
-    X = last_row[feature_cols].fillna(0.0)
+    Raises:
+      - RuntimeError if model was never trained
+      - ValueError if ticker not seen in training
+    """
+    clf, X = latest_feature_row(ticker)
     proba = clf.predict_proba(X)[0, 1]
 
     prob_up = float(proba)
     logger.info("predict_next(%s) -> prob_up=%.4f", ticker, prob_up)
-    return prob_up
\ No newline at end of file
+    return prob_up
@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-from datetime import date, datetime
-from typing import List
-
-import requests
+import re
+import threading
+from datetime import date
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import httpx
+import numpy as np
+import orjson
 import pandas as pd
+from cachetools import TTLCache
+
+from app.services import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +24,24 @@ logger = logging.getLogger(__name__)
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY") or os.getenv("NEWS_API_KEY")
 MEDIASTACK_KEY = os.getenv("MEDIASTACK_API_KEY") or os.getenv("MEDIASTACK_KEY")
 
+# Non-empty per-provider article frames keyed on (provider, ticker, start, end)
+_NEWS_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+_NEWS_CACHE_LOCK = threading.Lock()
+
+
+def _empty_news_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        columns=[
+            "ticker",
+            "date",
+            "news_sent_mean",
+            "news_sent_std",
+            "news_count",
+            "news_pos_share",
+            "news_neg_share",
+        ]
+    )
+
 
 # ---------- Simple keyword-based sentiment (no extra libs) ----------
 
@@ -32,37 +58,54 @@ NEG_WORDS = {
 }
 
 
-def _score_text(text: str) -> float:
+# Whole-word matchers, compiled once at import
+POS_RE = re.compile(r"\b(" + "|".join(map(re.escape, sorted(POS_WORDS))) + r")\b")
+NEG_RE = re.compile(r"\b(" + "|".join(map(re.escape, sorted(NEG_WORDS))) + r")\b")
+
+
+def _score_texts(texts: pd.Series) -> pd.Series:
     """
-    Very rough sentiment score in [-1, 1] based on simple word counts.
+    Very rough sentiment score in [-1, 1] for each text, based on counts of
+    positive vs negative words. Scores the whole column in one vectorized
+    pass; texts with no matches (or missing) score 0.
     You can later replace this with a proper library if you want.
     """
-    if not text:
-        return 0.0
+    lowered = texts.str.lower()
+    pos = lowered.str.count(POS_RE).fillna(0)
+    neg = lowered.str.count(NEG_RE).fillna(0)
 
-    txt = text.lower()
-    pos = sum(w in txt for w in POS_WORDS)
-    neg = sum(w in txt for w in NEG_WORDS)
+    score = (pos - neg) / (pos + neg).replace(0, np.nan)
+    return score.fillna(0.0).clip(-1.0, 1.0).astype(np.float32)
 
-    if pos == 0 and neg == 0:
-        return 0.0
 
-    score = (pos - neg) / float(pos + neg)
-    return max(-1.0, min(1.0, score))
+def _published_dates(published: List[Optional[str]], default: date) -> pd.Series:
+    """
+    Parse raw ISO-8601 publish timestamps in one vectorized call and return
+    their UTC calendar dates as datetime64 (midnight); missing or unparseable
+    values fall back to `default`.
+    """
+    dt = pd.to_datetime(
+        pd.Series(published, dtype=object),
+        utc=True,
+        errors="coerce",
+        format="ISO8601",
+    )
+    return dt.dt.tz_localize(None).dt.normalize().fillna(pd.Timestamp(default))
 
 
 # ---------- NewsAPI ----------
 
-def fetch_newsapi_news(ticker: str, start: date, end: date) -> pd.DataFrame:
+async def fetch_newsapi_news(
+    client: httpx.AsyncClient, ticker: str, start: date, end: date
+) -> pd.DataFrame:
     """
-    Fetch raw articles from NewsAPI for a single ticker and return a DataFrame
-    with columns: ['ticker', 'date', 'title', 'description', 'sentiment'].
+    Fetch articles from NewsAPI for a single ticker and return one scored row
+    per article, with columns: ['ticker', 'date', 'sentiment'].
+    Titles/descriptions are only used for scoring and are not returned.
     """
     if not NEWSAPI_KEY:
         logger.warning("NEWSAPI_KEY not set; skipping NewsAPI for %s", ticker)
-        return pd.DataFrame(
-            columns=["ticker", "date", "title", "description", "sentiment"]
-        )
+        return pd.DataFrame(columns=["ticker", "date", "sentiment"])
 
     url = "https://newsapi.org/v2/everything"
     query = f'"{ticker}" AND (stock OR share OR earnings OR market)'
@@ -77,66 +120,58 @@ def fetch_newsapi_news(ticker: str, start: date, end: date) -> pd.DataFrame:
         "apiKey": NEWSAPI_KEY,
     }
 
-    resp = requests.get(url, params=params, timeout=15)
+    resp = await client.get(url, params=params)
     logger.info("NewsAPI request status=%s url=%s", resp.status_code, resp.url)
 
     if resp.status_code != 200:
         logger.warning("NewsAPI error for %s: %s", ticker, resp.text)
-        return pd.DataFrame(
-            columns=["ticker", "date", "title", "description", "sentiment"]
-        )
+        return pd.DataFrame(columns=["ticker", "date", "sentiment"])
 
-    data = resp.json()
+    data = orjson.loads(resp.content)
     if data.get("status") != "ok":
         logger.warning("NewsAPI returned non-ok status for %s: %s", ticker, data)
-        return pd.DataFrame(
-            columns=["ticker", "date", "title", "description", "sentiment"]
-        )
+        return pd.DataFrame(columns=["ticker", "date", "sentiment"])
 
-    rows = []
-    for a in data.get("articles", []):
-        title = a.get("title") or ""
-        desc = a.get("description") or ""
-        text = f"{title}. {desc}".strip()
-        sent = _score_text(text)
-
-        published_at = a.get("publishedAt")
-        if published_at:
-            try:
-                dt = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-                d = dt.date()
-            except Exception:
-                d = start
-        else:
-            d = start
-
-        rows.append(
-            {
-                "ticker": ticker,
-                "date": d,
-                "title": title,
-                "description": desc,
-                "sentiment": float(sent),
-            }
-        )
+    articles = data.get("articles") or []
+    if not articles:
+        logger.info("NewsAPI returned 0 articles for %s", ticker)
+        return pd.DataFrame(columns=["ticker", "date", "sentiment"])
 
-    df = pd.DataFrame(rows)
+    published: List[Optional[str]] = []
+    titles: List[str] = []
+    descs: List[str] = []
+    for a in articles:
+        titles.append(a.get("title") or "")
+        descs.append(a.get("description") or "")
+        published.append(a.get("publishedAt"))
+
+    text = pd.Series(titles) + ". " + pd.Series(descs)
+    df = pd.DataFrame(
+        {
+            "ticker": ticker,
+            "date": _published_dates(published, start),
+            "sentiment": _score_texts(text),
+        }
+    )
+    # Providers can return articles outside the requested window; they would
+    # never match a price row, so drop them before any concat/groupby work
+    df = df[df["date"].between(pd.Timestamp(start), pd.Timestamp(end))]
     logger.info("NewsAPI returned %d articles for %s", len(df), ticker)
     return df
 
 
 # ---------- Mediastack ----------
 
-def fetch_mediastack_news(ticker: str, start: date, end: date) -> pd.DataFrame:
+async def fetch_mediastack_news(
+    client: httpx.AsyncClient, ticker: str, start: date, end: date
+) -> pd.DataFrame:
     """
     Fetch raw articles from Mediastack for a single ticker.
     Returns same columns as fetch_newsapi_news.
     """
     if not MEDIASTACK_KEY:
         logger.warning("MEDIASTACK_API_KEY not set; skipping Mediastack for %s", ticker)
-        return pd.DataFrame(
-            columns=["ticker", "date", "title", "description", "sentiment"]
-        )
+        return pd.DataFrame(columns=["ticker", "date", "sentiment"])
 
     url = "http://api.mediastack.com/v1/news"
     params = {
@@ -148,60 +183,80 @@ def fetch_mediastack_news(ticker: str, start: date, end: date) -> pd.DataFrame:
         "sort": "popularity",
     }
 
-    resp = requests.get(url, params=params, timeout=15)
+    resp = await client.get(url, params=params)
     logger.info("Mediastack request status=%s url=%s", resp.status_code, resp.url)
 
     if resp.status_code != 200:
         logger.warning("Mediastack error for %s: %s", ticker, resp.text)
-        return pd.DataFrame(
-            columns=["ticker", "date", "title", "description", "sentiment"]
-        )
+        return pd.DataFrame(columns=["ticker", "date", "sentiment"])
 
-    data = resp.json()
+    data = orjson.loads(resp.content)
     articles = data.get("data", []) or []
+    if not articles:
+        logger.info("Mediastack returned 0 articles for %s", ticker)
+        return pd.DataFrame(columns=["ticker", "date", "sentiment"])
 
-    rows = []
+    published: List[Optional[str]] = []
+    titles: List[str] = []
+    descs: List[str] = []
     for a in articles:
-        title = a.get("title") or ""
-        desc = a.get("description") or ""
-        text = f"{title}. {desc}".strip()
-        sent = _score_text(text)
-
-        published_at = a.get("published_at")
-        if published_at:
-            try:
-                dt = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-                d = dt.date()
-            except Exception:
-                d = start
-        else:
-            d = start
-
-        rows.append(
-            {
-                "ticker": ticker,
-                "date": d,
-                "title": title,
-                "description": desc,
-                "sentiment": float(sent),
-            }
-        )
-
-    df = pd.DataFrame(rows)
+        titles.append(a.get("title") or "")
+        descs.append(a.get("description") or "")
+        published.append(a.get("published_at"))
+
+    text = pd.Series(titles) + ". " + pd.Series(descs)
+    df = pd.DataFrame(
+        {
+            "ticker": ticker,
+            "date": _published_dates(published, start),
+            "sentiment": _score_texts(text),
+        }
+    )
+    # Providers can return articles outside the requested window; they would
+    # never match a price row, so drop them before any concat/groupby work
+    df = df[df["date"].between(pd.Timestamp(start), pd.Timestamp(end))]
     logger.info("Mediastack returned %d articles for %s", len(df), ticker)
     return df
 
 
 # ---------- High-level: daily aggregates per ticker ----------
 
-def fetch_news_for_tickers(
+def _cache_key(
+    provider: str, ticker: str, start: date, end: date
+) -> Tuple[str, str, str, str]:
+    return (provider, ticker, start.isoformat(), end.isoformat())
+
+
+async def _fetch_cached(
+    provider: str,
+    fetch: Callable[[httpx.AsyncClient, str, date, date], Awaitable[pd.DataFrame]],
+    client: httpx.AsyncClient,
+    ticker: str,
+    start: date,
+    end: date,
+) -> pd.DataFrame:
+    """Serve fetch(client, ticker, start, end) from _NEWS_CACHE when possible."""
+    key = _cache_key(provider, ticker, start, end)
+    with _NEWS_CACHE_LOCK:
+        cached = _NEWS_CACHE.get(key)
+    if cached is not None:
+        return cached.copy()
+
+    df = await fetch(client, ticker, start, end)
+    if not df.empty:
+        with _NEWS_CACHE_LOCK:
+            _NEWS_CACHE[key] = df.copy(deep=True)
+    return df
+
+
+async def fetch_news_for_tickers(
     tickers: List[str],
     start: date,
     end: date,
 ) -> pd.DataFrame:
     """
     For each ticker:
-      - pull news from NewsAPI and Mediastack,
+      - pull news from NewsAPI and Mediastack (all requests concurrently),
       - combine,
       - compute daily aggregates:
           news_sent_mean
@@ -212,62 +267,63 @@ def fetch_news_for_tickers(
     Returns columns:
       ['ticker', 'date', 'news_sent_mean', 'news_sent_std',
        'news_count', 'news_pos_share', 'news_neg_share']
+    with 'date' as datetime64 (UTC day).
     """
-    all_rows = []
-
-    for t in tickers:
-        try:
-            newsapi_df = fetch_newsapi_news(t, start, end)
-        except Exception as e:
-            logger.exception("Error fetching NewsAPI for %s: %s", t, e)
-            newsapi_df = pd.DataFrame(
-                columns=["ticker", "date", "title", "description", "sentiment"]
-            )
-
-        try:
-            mediastack_df = fetch_mediastack_news(t, start, end)
-        except Exception as e:
-            logger.exception("Error fetching Mediastack for %s: %s", t, e)
-            mediastack_df = pd.DataFrame(
-                columns=["ticker", "date", "title", "description", "sentiment"]
-            )
-
-        combined = pd.concat(
-            [newsapi_df, mediastack_df], ignore_index=True
-        ).dropna(subset=["date"])
-
-        if combined.empty:
+    # One request per (ticker, provider), all in flight at once
+    providers = (
+        ("NewsAPI", fetch_newsapi_news),
+        ("Mediastack", fetch_mediastack_news),
+    )
+    tasks = [(t, name, fn) for t in tickers for name, fn in providers]
+
+    async with http_client.client() as client:
+        results = await asyncio.gather(
+            *(_fetch_cached(name, fn, client, t, start, end) for t, name, fn in tasks),
+            return_exceptions=True,
+        )
+
+    # Flat list of non-empty (ticker, provider) frames -> exactly one concat
+    frames: List[pd.DataFrame] = []
+    for (t, name, _), res in zip(tasks, results):
+        if isinstance(res, BaseException):
+            logger.error("Error fetching %s for %s: %s", name, t, res, exc_info=res)
             continue
+        if not res.empty:
+            frames.append(res)
 
-        combined["date"] = pd.to_datetime(combined["date"]).dt.date
-        all_rows.append(combined)
+    # Nothing came back (keys unset, rate-limited, quiet window): skip the
+    # concat/groupby entirely
+    if not frames:
+        logger.warning("No news data returned for tickers=%s", tickers)
+        return _empty_news_df()
 
-    if not all_rows:
+    all_df = pd.concat(frames, ignore_index=True).dropna(subset=["date"])
+    if all_df.empty:
         logger.warning("No news data returned for tickers=%s", tickers)
-        return pd.DataFrame(
-            columns=[
-                "ticker",
-                "date",
-                "news_sent_mean",
-                "news_sent_std",
-                "news_count",
-                "news_pos_share",
-                "news_neg_share",
-            ]
-        )
+        return _empty_news_df()
 
-    all_df = pd.concat(all_rows, ignore_index=True)
+    all_df["pos"] = (all_df["sentiment"] > 0).astype("int8")
+    all_df["neg"] = (all_df["sentiment"] < 0).astype("int8")
 
     agg = (
-        all_df.groupby(["ticker", "date"])["sentiment"]
+        all_df.groupby(["ticker", "date"], sort=False)
         .agg(
-            news_sent_mean="mean",
-            news_sent_std="std",
-            news_count="count",
-            news_pos_share=lambda s: (s > 0).mean(),
-            news_neg_share=lambda s: (s < 0).mean(),
+            news_sent_mean=("sentiment", "mean"),
+            news_sent_std=("sentiment", "std"),
+            news_count=("sentiment", "count"),
+            news_pos_share=("pos", "mean"),
+            news_neg_share=("neg", "mean"),
         )
         .reset_index()
+        .astype(
+            {
+                "news_sent_mean": np.float32,
+                "news_sent_std": np.float32,
+                "news_count": np.int32,
+                "news_pos_share": np.float32,
+                "news_neg_share": np.float32,
+            }
+        )
     )
 
     logger.info(
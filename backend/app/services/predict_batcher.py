@@ -0,0 +1,101 @@
+# app/services/predict_batcher.py
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import weakref
+from typing import TYPE_CHECKING, List, Tuple
+
+import numpy as np
+
+from app.services import model_service
+
+if TYPE_CHECKING:
+    from sklearn.ensemble import RandomForestClassifier
+
+logger = logging.getLogger(__name__)
+
+# Requests arriving within this window share one predict_proba call
+BATCH_WINDOW_S = 0.01
+MAX_BATCH = 32
+
+
+class _Batch:
+    """Feature rows waiting for the same model, plus the futures to resolve."""
+
+    def __init__(self, clf: RandomForestClassifier) -> None:
+        self.clf = clf
+        self.items: List[Tuple[np.ndarray, asyncio.Future]] = []
+
+
+# Open batch per event loop (at most one is accepting requests at a time)
+_OPEN_BATCH: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Batch]" = (
+    weakref.WeakKeyDictionary()
+)
+# Strong refs so pending flush tasks aren't garbage-collected mid-sleep
+_FLUSH_TASKS: "set[asyncio.Task]" = set()
+
+
+async def _flush_after_window(loop: asyncio.AbstractEventLoop, batch: _Batch) -> None:
+    await asyncio.sleep(BATCH_WINDOW_S)
+    if _OPEN_BATCH.get(loop) is batch:
+        del _OPEN_BATCH[loop]
+
+    # Anything that fails here, stacking included, must reach every future:
+    # an unresolved one would leave its request waiting forever
+    try:
+        X = np.vstack([x for x, _ in batch.items])
+        logger.debug("predict batch size=%d", len(X))
+        proba = await loop.run_in_executor(
+            None, lambda: batch.clf.predict_proba(X)[:, 1]
+        )
+    except Exception as e:
+        for _, fut in batch.items:
+            if not fut.done():
+                fut.set_exception(e)
+        return
+
+    for (_, fut), p in zip(batch.items, proba):
+        if not fut.done():
+            fut.set_result(float(p))
+
+
+async def predict_next(ticker: str) -> float:
+    """
+    Async, batched version of model_service.predict_next.
+
+    The first request opens a batch and schedules a flush BATCH_WINDOW_S later;
+    requests arriving meanwhile (up to MAX_BATCH) join it, and the flush runs a
+    single predict_proba over all their rows in the default executor.
+
+    Raises the same RuntimeError / ValueError as model_service.predict_next,
+    before anything is queued.
+    """
+    loop = asyncio.get_running_loop()
+    if model_service.has_model():
+        clf, x = model_service.latest_feature_row(ticker)
+    else:
+        # Falls back to loading the persisted model from disk: keep that off
+        # the event loop so other requests aren't stalled behind it
+        clf, x = await loop.run_in_executor(
+            None, model_service.latest_feature_row, ticker
+        )
+    batch = _OPEN_BATCH.get(loop)
+    # A retrain swaps the model; rows for the new model start a fresh batch
+    if batch is None or batch.clf is not clf:
+        batch = _Batch(clf)
+        _OPEN_BATCH[loop] = batch
+        task = loop.create_task(_flush_after_window(loop, batch))
+        _FLUSH_TASKS.add(task)
+        task.add_done_callback(_FLUSH_TASKS.discard)
+
+    fut = loop.create_future()
+    batch.items.append((x, fut))
+    if len(batch.items) >= MAX_BATCH:
+        # full: stop accepting; the scheduled flush still runs it
+        del _OPEN_BATCH[loop]
+
+    prob_up = await fut
+    logger.info("predict_next(%s) -> prob_up=%.4f", ticker, prob_up)
+    return prob_up
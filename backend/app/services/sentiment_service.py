@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import date
 from typing import List
@@ -25,7 +26,8 @@ def _normalize_price_frame(prices: pd.DataFrame) -> pd.DataFrame:
     if prices is None or prices.empty:
         raise ValueError("Prices DataFrame is empty in build_training_frame")
 
-    df = prices.copy()
+    # No defensive copy: every step below returns a new frame
+    df = prices
 
     # Flatten MultiIndex index if present
     if isinstance(df.index, pd.MultiIndex):
@@ -40,7 +42,7 @@ def _normalize_price_frame(prices: pd.DataFrame) -> pd.DataFrame:
         else:
             raise ValueError("Could not find 'date' column in prices DataFrame")
 
-    df["date"] = pd.to_datetime(df["date"]).dt.date
+    df = df.assign(date=pd.to_datetime(df["date"]).dt.date)
 
     # Ensure 'ticker' column
     if "ticker" not in df.columns:
@@ -70,7 +72,10 @@ def _normalize_price_frame(prices: pd.DataFrame) -> pd.DataFrame:
     logger.info("Using '%s' as price column to build target_up", price_col)
 
     df = df.sort_values(["ticker", "date"])
-    df["next_close"] = df.groupby("ticker")[price_col].shift(-1)
+    # Whole-column shift, masked where the next row starts another ticker
+    df["next_close"] = df[price_col].shift(-1).where(
+        df["ticker"].eq(df["ticker"].shift(-1))
+    )
 
     # target_up = 1 if next_close > current_close else 0
     df["target_up"] = (df["next_close"] > df[price_col]).astype(float)
@@ -81,6 +86,23 @@ def _normalize_price_frame(prices: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _with_merge_keys(frame: pd.DataFrame, ticker_dtype: pd.CategoricalDtype) -> pd.DataFrame:
+    """Return frame with 'ticker' as ticker_dtype and 'date' as datetime64."""
+    return frame.assign(
+        ticker=frame["ticker"].astype(ticker_dtype),
+        date=pd.to_datetime(frame["date"]),
+    )
+
+
+async def _fetch_sentiment(tickers: List[str], start: date, end: date) -> list:
+    """Fetch daily news and twitter aggregates together; failures are returned."""
+    return await asyncio.gather(
+        fetch_news_for_tickers(tickers, start, end),
+        fetch_twitter_for_tickers(tickers, start, end),
+        return_exceptions=True,
+    )
+
+
 def build_training_frame(
     prices: pd.DataFrame,
     tickers: List[str],
@@ -92,6 +114,9 @@ def build_training_frame(
       - price/return/volatility features + target_up  (from `prices`)
       - daily aggregated news sentiment               (NewsAPI + Mediastack)
       - daily aggregated twitter sentiment            (Twitter recent search)
+
+    When any sentiment was merged, 'ticker' comes back categorical and
+    'date' as datetime64.
     """
     # 1) Normalize prices & ensure target_up
     df = _normalize_price_frame(prices)
@@ -105,11 +130,14 @@ def build_training_frame(
             f"No price rows in training window after filtering: start={start}, end={end}"
         )
 
-    # 2) News sentiment (can be empty if keys not set)
-    try:
-        news_daily = fetch_news_for_tickers(tickers, start, end)
-    except Exception as e:
-        logger.exception("Error while fetching news sentiment: %s", e)
+    # 2) + 3) News and Twitter sentiment, fetched concurrently (either can be
+    #    empty if keys are not set)
+    news_daily, tw_daily = asyncio.run(_fetch_sentiment(tickers, start, end))
+
+    if isinstance(news_daily, BaseException):
+        logger.error(
+            "Error while fetching news sentiment: %s", news_daily, exc_info=news_daily
+        )
         news_daily = pd.DataFrame(
             columns=[
                 "ticker",
@@ -122,14 +150,10 @@ def build_training_frame(
             ]
         )
 
-    if not news_daily.empty:
-        news_daily["date"] = pd.to_datetime(news_daily["date"]).dt.date
-
-    # 3) Twitter sentiment (can be empty if bearer token not set)
-    try:
-        tw_daily = fetch_twitter_for_tickers(tickers, start, end)
-    except Exception as e:
-        logger.exception("Error while fetching twitter sentiment: %s", e)
+    if isinstance(tw_daily, BaseException):
+        logger.error(
+            "Error while fetching twitter sentiment: %s", tw_daily, exc_info=tw_daily
+        )
         tw_daily = pd.DataFrame(
             columns=[
                 "ticker",
@@ -142,15 +166,19 @@ def build_training_frame(
             ]
         )
 
-    if not tw_daily.empty:
-        tw_daily["date"] = pd.to_datetime(tw_daily["date"]).dt.date
-
-    # 4) Merge on simple columns ['ticker', 'date']
-    if not news_daily.empty:
-        df = df.merge(news_daily, on=["ticker", "date"], how="left")
-
-    if not tw_daily.empty:
-        df = df.merge(tw_daily, on=["ticker", "date"], how="left")
+    # 4) Merge on ['ticker', 'date'] with encoded keys: one shared categorical
+    #    for ticker and datetime64 for date, so the joins hash integer codes
+    #    instead of Python str/date objects
+    sides = [f for f in (news_daily, tw_daily) if not f.empty]
+    if sides:
+        ticker_dtype = pd.CategoricalDtype(
+            sorted(set(df["ticker"]).union(*(f["ticker"] for f in sides)))
+        )
+        df = _with_merge_keys(df, ticker_dtype)
+        for side in sides:
+            df = df.merge(
+                _with_merge_keys(side, ticker_dtype), on=["ticker", "date"], how="left"
+            )
 
     logger.info(
         "Final training frame shape after merges: rows=%d, cols=%d",
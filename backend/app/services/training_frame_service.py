@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 
@@ -21,19 +22,23 @@ def build_training_frame(df: pd.DataFrame) -> pd.DataFrame:
     if missing:
         raise ValueError(f"build_training_frame: missing required columns: {missing}")
 
-    out = df.copy()
-    out = out.sort_values(["ticker", "date"])
-
-    # next day's close per ticker
-    out["next_close"] = out.groupby("ticker")["Close"].shift(-1)
-
-    # drop rows with no next_close (last row per ticker)
-    out = out[out["next_close"].notna()].copy()
-
-    # binary target: 1 if next close is higher than today's close
-    out["target_up"] = (out["next_close"] > out["Close"]).astype(int)
-
-    out.drop(columns=["next_close"], inplace=True)
+    # sort_values returns a new frame, so the caller's df is never mutated
+    out = df.sort_values(["ticker", "date"])
+
+    # next day's close per ticker: shift the whole (sorted) column and blank
+    # out each ticker's last row, where the next row belongs to another ticker
+    next_close = out["Close"].shift(-1).where(
+        out["ticker"].eq(out["ticker"].shift(-1))
+    )
+
+    # drop rows with no next_close (last row per ticker) and add the binary
+    # target: 1 if next close is higher than today's close. assign() builds
+    # a new frame, so no column is written into the filtered slice (which
+    # pandas < 3 flags with SettingWithCopyWarning).
+    has_next = next_close.notna()
+    out = out.loc[has_next].assign(
+        target_up=lambda f: (next_close[has_next] > f["Close"]).astype(np.int8)
+    )
 
     if out.empty:
         raise ValueError("No rows available to build training frame.")
@@ -0,0 +1,122 @@
+# app/services/training_service.py
+
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from cachetools import TTLCache
+
+from app.services.market_data_service import fetch_prices_for_tickers
+from app.services.feature_service import add_price_features
+from app.services.training_frame_service import build_training_frame
+from app.services import model_service
+
+logger = logging.getLogger(__name__)
+
+
+def run_training(tickers: List[str], start: date, end: date) -> Dict[str, Any]:
+    """
+    Full training pipeline: fetch prices -> features -> training frame -> fit.
+
+    Expects already-normalized tickers and a validated date range.
+
+    Raises:
+      - ValueError with a user-facing message if there is no usable data
+        (no prices, too few rows, no feature columns, ...)
+
+    Returns the /model/train response body.
+    """
+    # ---- 1. Fetch prices ----
+    prices = fetch_prices_for_tickers(tickers=tickers, start=start, end=end)
+    if prices is None or prices.empty:
+        raise ValueError("No price data returned for given tickers and date range")
+
+    # ---- 2. Feature engineering ----
+    prices_with_features = add_price_features(prices)
+
+    # ---- 3. Build training frame ----
+    train_df = build_training_frame(prices_with_features)
+
+    if len(train_df) < 2:
+        raise ValueError(
+            f"Not enough rows to train a model (n={len(train_df)}). Need at least 2."
+        )
+
+    # ---- 4. Train model (maps into global state used by /predict-next) ----
+    metrics = model_service.train_model(train_df)
+
+    return {
+        "message": "Training completed",
+        "tickers": tickers,
+        "effective_start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "train_rows": int(len(train_df)),
+        "price_rows": int(len(prices)),
+        "roc_auc": metrics.get("roc_auc"),
+        "warning": None,
+    }
+
+
+# ---------- Background training jobs ----------
+
+# Training swaps module-level model state, so jobs run one at a time.
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="train-job")
+
+# job_id -> {"job_id", "status", "result", "error"}. Queued/running jobs stay
+# in _ACTIVE_JOBS until they finish; only then do they move to _FINISHED_JOBS,
+# so the TTL counts from completion and a pending job is never evicted.
+_ACTIVE_JOBS: Dict[str, Dict[str, Any]] = {}
+_FINISHED_JOBS: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+_JOBS_LOCK = threading.Lock()
+
+
+def _update_job(job: Dict[str, Any], **fields: Any) -> None:
+    with _JOBS_LOCK:
+        job.update(fields)
+
+
+def _run_job(job: Dict[str, Any], tickers: List[str], start: date, end: date) -> None:
+    _update_job(job, status="running")
+    try:
+        _update_job(job, result=run_training(tickers, start, end), status="completed")
+    except ValueError as e:
+        _update_job(job, error=str(e), status="failed")
+    except Exception as e:
+        logger.exception("Training job %s crashed", job["job_id"])
+        _update_job(job, error=f"Training failed: {e}", status="failed")
+    finally:
+        with _JOBS_LOCK:
+            _ACTIVE_JOBS.pop(job["job_id"], None)
+            _FINISHED_JOBS[job["job_id"]] = job
+
+
+def submit_training_job(tickers: List[str], start: date, end: date) -> Dict[str, Any]:
+    """
+    Queue run_training on the background worker and return the job record
+    (status "queued"). Poll it with get_training_job.
+    """
+    job: Dict[str, Any] = {
+        "job_id": uuid.uuid4().hex,
+        "status": "queued",
+        "result": None,
+        "error": None,
+    }
+    with _JOBS_LOCK:
+        _ACTIVE_JOBS[job["job_id"]] = job
+        queued = dict(job)
+
+    _EXECUTOR.submit(_run_job, job, tickers, start, end)
+    logger.info("Queued training job %s for %s", job["job_id"], tickers)
+    return queued
+
+
+def get_training_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Snapshot of a job record, or None if unknown/expired."""
+    with _JOBS_LOCK:
+        job = _ACTIVE_JOBS.get(job_id) or _FINISHED_JOBS.get(job_id)
+        return dict(job) if job is not None else None
@@ -2,18 +2,31 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+import re
+import threading
 from datetime import date, datetime, timedelta, timezone
-from typing import Dict, List, Any
+from typing import Any, Dict, List, Optional, Tuple
 
+import httpx
+import numpy as np
+import orjson
 import pandas as pd
-import requests
+from cachetools import TTLCache
+from numba import njit
+
+from app.services import http_client
 
 logger = logging.getLogger(__name__)
 
 TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
 
+# Non-empty raw tweet frames keyed on (ticker, start, end). Short TTL: the
+# search window is clipped relative to "now", so results drift over time.
+_TWITTER_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=600)
+_TWITTER_CACHE_LOCK = threading.Lock()
 
 def _empty_twitter_df() -> pd.DataFrame:
     return pd.DataFrame(
@@ -34,19 +47,25 @@ _POS_WORDS = {"good", "great", "bull", "bullish", "up", "gain", "gains", "green"
 _NEG_WORDS = {"bad", "terrible", "bear", "bearish", "down", "loss", "losses", "red"}
 
 
+# Both lexicons in one whole-word matcher, compiled once at import; the named
+# group tells which side each match came from, so a tweet is scanned once.
+_SENT_RE = re.compile(
+    r"\b(?:(?P<pos>"
+    + "|".join(map(re.escape, sorted(_POS_WORDS)))
+    + r")|(?P<neg>"
+    + "|".join(map(re.escape, sorted(_NEG_WORDS)))
+    + r"))\b"
+)
+
+
 def _simple_sentiment(text: str) -> float:
     """
     Heuristic sentiment in [-1, 1] using a tiny keyword lexicon.
     This is intentionally simple – just to have a numeric signal.
     """
-    text_l = text.lower()
     score = 0
-    for w in _POS_WORDS:
-        if w in text_l:
-            score += 1
-    for w in _NEG_WORDS:
-        if w in text_l:
-            score -= 1
+    for m in _SENT_RE.finditer(text.lower()):
+        score += 1 if m.lastgroup == "pos" else -1
 
     if score == 0:
         return 0.0
@@ -56,8 +75,8 @@ def _simple_sentiment(text: str) -> float:
     return -1.0
 
 
-def _fetch_twitter_for_single(
-    ticker: str, start: date, end: date
+async def _fetch_twitter_for_single(
+    client: httpx.AsyncClient, ticker: str, start: date, end: date
 ) -> pd.DataFrame:
     """
     Fetch recent tweets for one ticker between start and end (as best as Twitter allows).
@@ -119,43 +138,94 @@ def _fetch_twitter_for_single(
     }
 
     logger.info("Calling Twitter API for %s: %s", ticker, url)
-    resp = requests.get(url, headers=headers, params=params)
+    resp = await client.get(url, headers=headers, params=params)
     if resp.status_code != 200:
         logger.error("Twitter API error: %s %s", resp.status_code, resp.text)
         return pd.DataFrame(columns=["ticker", "created_at", "text", "sentiment"])
 
-    data = resp.json()
+    data = orjson.loads(resp.content)
     tweets = data.get("data", [])
     if not tweets:
         logger.info("No tweets found for %s in the given window", ticker)
         return pd.DataFrame(columns=["ticker", "created_at", "text", "sentiment"])
 
-    rows = []
+    created: List[Optional[str]] = []
+    texts: List[str] = []
+    sents: List[float] = []
     for tw in tweets:
         text = tw.get("text", "")
-        created_at_str = tw.get("created_at")
-        try:
-            created_at = datetime.fromisoformat(
-                created_at_str.replace("Z", "+00:00")
-            )
-        except Exception:
-            created_at = now_utc
-
-        sent = _simple_sentiment(text)
-        rows.append(
-            {
-                "ticker": ticker,
-                "created_at": created_at,
-                "text": text,
-                "sentiment": sent,
-            }
-        )
+        created.append(tw.get("created_at"))
+        texts.append(text)
+        sents.append(_simple_sentiment(text))
+
+    # One vectorized parse; missing/unparseable timestamps fall back to now
+    created_at = pd.to_datetime(
+        pd.Series(created, dtype=object),
+        utc=True,
+        errors="coerce",
+        format="ISO8601",
+    ).fillna(pd.Timestamp(now_utc))
+
+    df = pd.DataFrame(
+        {
+            "ticker": ticker,
+            "created_at": created_at,
+            "text": texts,
+            "sentiment": np.asarray(sents, dtype=np.float32),
+        }
+    )
+    return df
+
 
-    df = pd.DataFrame(rows)
+@njit(cache=True)
+def _daily_sentiment_sums(
+    codes: np.ndarray, values: np.ndarray, ngroups: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-group sum, sum of squares, count, #positive and #negative of
+    `values`, where codes[i] in [0, ngroups) is the group of values[i].
+    Single pass over the data.
+    """
+    sums = np.zeros(ngroups)
+    sumsq = np.zeros(ngroups)
+    counts = np.zeros(ngroups, dtype=np.int64)
+    pos = np.zeros(ngroups, dtype=np.int64)
+    neg = np.zeros(ngroups, dtype=np.int64)
+    for i in range(values.shape[0]):
+        g = codes[i]
+        v = values[i]
+        sums[g] += v
+        sumsq[g] += v * v
+        counts[g] += 1
+        if v > 0:
+            pos[g] += 1
+        elif v < 0:
+            neg[g] += 1
+    return sums, sumsq, counts, pos, neg
+
+
+def _cache_key(ticker: str, start: date, end: date) -> Tuple[str, str, str]:
+    return (ticker, start.isoformat(), end.isoformat())
+
+
+async def _fetch_twitter_cached(
+    client: httpx.AsyncClient, ticker: str, start: date, end: date
+) -> pd.DataFrame:
+    """Serve _fetch_twitter_for_single from _TWITTER_CACHE when possible."""
+    key = _cache_key(ticker, start, end)
+    with _TWITTER_CACHE_LOCK:
+        cached = _TWITTER_CACHE.get(key)
+    if cached is not None:
+        return cached.copy()
+
+    df = await _fetch_twitter_for_single(client, ticker, start, end)
+    if not df.empty:
+        with _TWITTER_CACHE_LOCK:
+            _TWITTER_CACHE[key] = df.copy(deep=True)
     return df
 
 
-def fetch_twitter_for_tickers(
+async def fetch_twitter_for_tickers(
     tickers: List[str], start: date, end: date
 ) -> pd.DataFrame:
     """
@@ -165,40 +235,52 @@ def fetch_twitter_for_tickers(
       ['ticker', 'date',
        'tw_sent_mean', 'tw_sent_std', 'tw_count',
        'tw_pos_share', 'tw_neg_share']
+    with 'date' as datetime64 (UTC day).
     """
     all_raw: List[pd.DataFrame] = []
 
-    for ticker in tickers:
-        df_raw = _fetch_twitter_for_single(ticker, start, end)
-        logger.info("Twitter raw rows for %s: %d", ticker, len(df_raw))
-        if not df_raw.empty:
-            all_raw.append(df_raw)
+    async with http_client.client() as client:
+        results = await asyncio.gather(
+            *(_fetch_twitter_cached(client, t, start, end) for t in tickers),
+            return_exceptions=True,
+        )
+
+    for ticker, res in zip(tickers, results):
+        if isinstance(res, BaseException):
+            logger.error(
+                "Error fetching Twitter for %s: %s", ticker, res, exc_info=res
+            )
+            continue
+        logger.info("Twitter raw rows for %s: %d", ticker, len(res))
+        if not res.empty:
+            all_raw.append(res)
 
     if not all_raw:
         logger.info("No Twitter data found for tickers %s", tickers)
         return _empty_twitter_df()
 
     df_all = pd.concat(all_raw, ignore_index=True)
-    df_all["date"] = df_all["created_at"].dt.date
-
-    grouped = df_all.groupby(["ticker", "date"], as_index=False)
-
-    def _agg(group: pd.DataFrame) -> pd.Series:
-        sentiments = group["sentiment"].astype(float)
-        count = len(sentiments)
-        pos = (sentiments > 0).sum()
-        neg = (sentiments < 0).sum()
-        return pd.Series(
-            {
-                "tw_sent_mean": float(sentiments.mean()) if count > 0 else 0.0,
-                "tw_sent_std": float(sentiments.std(ddof=0)) if count > 0 else 0.0,
-                "tw_count": int(count),
-                "tw_pos_share": float(pos / count) if count > 0 else 0.0,
-                "tw_neg_share": float(neg / count) if count > 0 else 0.0,
-            }
-        )
+    # UTC calendar day as datetime64, not Python date objects
+    df_all["date"] = df_all["created_at"].dt.tz_localize(None).dt.normalize()
+
+    # One compiled pass over integer (ticker, date) group ids instead of
+    # several pandas groupby reductions
+    keys = pd.MultiIndex.from_arrays([df_all["ticker"], df_all["date"]])
+    codes, uniques = keys.factorize(sort=True)
+    sums, sumsq, counts, pos, neg = _daily_sentiment_sums(
+        codes.astype(np.int64),
+        df_all["sentiment"].to_numpy(dtype=np.float64),
+        len(uniques),
+    )
 
-    df_daily = grouped.apply(_agg).reset_index(drop=True)
+    mean = sums / counts
+    df_daily = uniques.to_frame(index=False, name=["ticker", "date"])
+    df_daily["tw_sent_mean"] = mean
+    # population std (ddof=0); clipped since rounding can dip just below 0
+    df_daily["tw_sent_std"] = np.sqrt(np.maximum(sumsq / counts - mean * mean, 0.0))
+    df_daily["tw_count"] = counts
+    df_daily["tw_pos_share"] = pos / counts
+    df_daily["tw_neg_share"] = neg / counts
 
     # Ensure column order
     df_daily = df_daily[
@@ -211,7 +293,15 @@ def fetch_twitter_for_tickers(
             "tw_pos_share",
             "tw_neg_share",
         ]
-    ]
+    ].astype(
+        {
+            "tw_sent_mean": np.float32,
+            "tw_sent_std": np.float32,
+            "tw_count": np.int32,
+            "tw_pos_share": np.float32,
+            "tw_neg_share": np.float32,
+        }
+    )
 
     logger.info(
         "Aggregated twitter sentiment shape: rows=%d, cols=%d",
@@ -225,5 +315,8 @@ def fetch_twitter_for_tickers(
 def fetch_twitter(
     tickers: List[str], start: date, end: date
 ) -> pd.DataFrame:
-    """Alias to keep older imports from breaking."""
-    return fetch_twitter_for_tickers(tickers, start, end)
\ No newline at end of file
+    """
+    Alias to keep older imports from breaking. Stays sync like the original
+    (runs its own event loop); async code awaits fetch_twitter_for_tickers.
+    """
+    return asyncio.run(fetch_twitter_for_tickers(tickers, start, end))
\ No newline at end of file
@@ -1,9 +1,12 @@
 # backend/debug_api_check.py
 import os
 from datetime import date
+import orjson
 import requests
 import pandas as pd
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load .env from project root or backend folder
 load_dotenv()
@@ -11,6 +14,21 @@ load_dotenv()
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
 TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
 
+# One keep-alive session for all checks
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False,
+    ),
+)
+_SESSION = requests.Session()
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
 
 def check_newsapi(ticker: str, start: date, end: date):
     print(f"\n=== Checking NewsAPI for {ticker} from {start} to {end} ===")
@@ -31,7 +49,7 @@ def check_newsapi(ticker: str, start: date, end: date):
         "apiKey": NEWSAPI_KEY,
     }
 
-    resp = requests.get(url, params=params, timeout=10)
+    resp = _SESSION.get(url, params=params, timeout=10)
     print("Status:", resp.status_code)
     print("URL:", resp.url)
 
@@ -39,7 +57,7 @@ def check_newsapi(ticker: str, start: date, end: date):
         print("Body:", resp.text[:500])
         return
 
-    data = resp.json()
+    data = orjson.loads(resp.content)
     articles = data.get("articles", [])
     print("Total articles:", len(articles))
 
@@ -74,7 +92,7 @@ def check_twitter(ticker: str):
     }
     headers = {"Authorization": f"Bearer {TWITTER_BEARER_TOKEN}"}
 
-    resp = requests.get(url, params=params, headers=headers, timeout=10)
+    resp = _SESSION.get(url, params=params, headers=headers, timeout=10)
     print("Status:", resp.status_code)
     print("URL:", resp.url)
 
@@ -82,7 +100,7 @@ def check_twitter(ticker: str):
         print("Body:", resp.text[:500])
         return
 
-    data = resp.json()
+    data = orjson.loads(resp.content)
     tweets = data.get("data", [])
     print("Total tweets:", len(tweets))
 
@@ -1,25 +1,166 @@
 # tests/conftest.py
 
+import asyncio
 import os
 import sys
+import zlib
 
-# Ensure the backend root (the directory that contains 'app') is on sys.path
-CURRENT_DIR = os.path.dirname(__file__)              # .../backend/tests
-BACKEND_ROOT = os.path.dirname(CURRENT_DIR)          # .../backend
+import numpy as np
+import pandas as pd
+import pytest
+import pytest_asyncio
+from cachetools import TTLCache
+from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 
-if BACKEND_ROOT not in sys.path:
-    sys.path.insert(0, BACKEND_ROOT)
+# helpers.py holds shared assert functions; rewrite them like test modules
+# (has to be registered before helpers is first imported, just below)
+pytest.register_assert_rewrite("helpers")
 
-from fastapi.testclient import TestClient
+from app.api.routes_symbols import POPULAR_STOCKS
 from app.main import app
+from app.services import market_data_service, marketstack_service, model_service
+from helpers import AAPL_LARGE_WINDOW
 
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+
+# uvloop (shipped with uvicorn[standard], not on Windows) for every loop the
+# tests create: pytest-asyncio's session loop and TestClient's portal loop
+if sys.platform != "win32":
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+_KNOWN_SYMBOLS = {s["symbol"] for s in POPULAR_STOCKS}
+# The fake's "today": dates after it have no prices. Fixed (the day after the
+# tests' latest end_date) so results don't change as the real date moves on.
+_FAKE_TODAY = pd.Timestamp("2025-12-05")
+# tickers argument of every fake yf.download call, in order (see yf_calls)
+_YF_CALLS: list = []
+
+
+def _fake_yf_download(tickers, start=None, end=None, **kwargs):
+    """
+    Offline stand-in for yf.download(..., group_by="ticker").
+
+    Known symbols get a deterministic random walk on business days in
+    [start, end) up to _FAKE_TODAY; unknown symbols and future dates get nothing,
+    like Yahoo. Returns an empty frame when no ticker has data.
+    """
+    _YF_CALLS.append(tickers)
+    if isinstance(tickers, str):
+        tickers = [tickers]
+
+    idx = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), name="Date")
+    idx = idx[idx <= _FAKE_TODAY]
+
+    frames = {}
+    for ticker in tickers:
+        if ticker not in _KNOWN_SYMBOLS or len(idx) == 0:
+            continue
+        # seed on the symbol and the first date so every run and window matches
+        rng = np.random.default_rng(zlib.crc32(f"{ticker}:{idx[0].date()}".encode()))
+        close = 100 + rng.standard_normal(len(idx)).cumsum()
+        frames[ticker] = pd.DataFrame(
+            {
+                "Open": close,
+                "High": close + 1,
+                "Low": close - 1,
+                "Close": close,
+                "Volume": rng.integers(1_000_000, 2_000_000, len(idx)).astype(float),
+            },
+            index=idx,
+        )
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, axis=1, names=["Ticker", "Price"])
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _fake_yf():
+    """
+    Keep the suite offline: every yfinance download goes to the fake, and the
+    Marketstack fallback (tickers/dates the fake has no prices for) runs as
+    if no API key were configured, even when one is set in the environment.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.services.market_data_service.yf.download", _fake_yf_download)
+        mp.setattr(marketstack_service, "MARKETSTACK_API_KEY", None)
+        yield
 
-import pytest
+
+@pytest.fixture(autouse=True, scope="session")
+def _model_path(tmp_path_factory):
+    """
+    Persist models trained by the suite to this session's tmp dir, never to
+    the default MODEL_PATH a local dev server serves. Under xdist each worker
+    gets its own file, so workers don't load each other's models.
+    """
+    name = f"stock_sentiment_model.{_XDIST_WORKER or 'main'}.joblib"
+    path = tmp_path_factory.mktemp("model") / name
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(model_service, "MODEL_PATH", str(path))
+        yield path
 
 
 @pytest.fixture
+def yf_calls(monkeypatch):
+    """
+    List of the tickers passed to each yf.download call during the test.
+    Starts with an empty price cache so every ticker is actually downloaded.
+    """
+    monkeypatch.setattr(
+        market_data_service, "_PRICE_CACHE", TTLCache(maxsize=1024, ttl=3600)
+    )
+    _YF_CALLS.clear()
+    return _YF_CALLS
+
+
+@pytest.fixture(scope="session")
 def client():
     """
-    Fresh TestClient for each test.
+    One TestClient for the whole session; entering it runs the app's
+    lifespan (startup/shutdown) once instead of per test, and keeps one
+    portal/event loop that every request reuses (outside the `with` block
+    TestClient would start a fresh one per request).
+
+    TestClient stays as the sync client: httpx's ASGITransport is async-only,
+    so a plain httpx.Client can't drive the app in-process.
+    """
+    with TestClient(app, backend="asyncio") as c:
+        yield c
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_client():
+    """
+    Async client that calls the app in-process through ASGITransport, so
+    independent requests can be awaited concurrently (asyncio.gather).
+    Note: ASGITransport does not run the app's lifespan.
+    """
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def large_window_train(client: TestClient):
+    """
+    Response of one AAPL 2025-11-01..2025-12-04 training run, shared by
+    the tests that only inspect it.
+    """
+    return client.post("/api/v1/model/train", json=dict(AAPL_LARGE_WINDOW))
+
+
+@pytest.fixture(scope="module")
+def trained_client(client: TestClient):
+    """
+    The module's client, after training a model once on AAPL that the
+    predict tests can share.
     """
-    return TestClient(app)
\ No newline at end of file
+    resp = client.post("/api/v1/model/train", json=dict(AAPL_LARGE_WINDOW))
+    assert resp.status_code == 200
+    yield client
\ No newline at end of file
@@ -0,0 +1,40 @@
+# tests/helpers.py
+
+from types import MappingProxyType
+
+import orjson
+
+# Read-only request payloads shared by conftest fixtures and tests; tickers are
+# tuples so nothing nested can be mutated either. httpx's JSON encoder only
+# takes real dicts (tuples encode as lists), so post them as json=dict(PAYLOAD).
+AAPL_LARGE_WINDOW = MappingProxyType(
+    {"tickers": ("AAPL",), "start_date": "2025-11-01", "end_date": "2025-12-04"}
+)
+
+
+def body(resp):
+    """Decode a response's JSON body with orjson (the app encodes with it too)."""
+    return orjson.loads(resp.content)
+
+
+def assert_detail(resp, status, needle):
+    """Assert the status code and that `needle` (bytes) is in the raw body."""
+    assert resp.status_code == status, resp.content
+    assert needle in resp.content
+
+
+def assert_trained(resp, tickers, min_rows=1):
+    """
+    Assert a successful /model/train response for `tickers` with at least
+    `min_rows` training rows; returns the decoded body for extra checks.
+    """
+    assert resp.status_code == 200, resp.content
+    data = body(resp)
+
+    assert data["message"] == "Training completed"
+    assert sorted(data["tickers"]) == sorted(tickers)
+    assert data["train_rows"] >= min_rows
+    assert data["price_rows"] >= data["train_rows"]
+    # roc_auc may be None if only one class in y_test
+    assert "roc_auc" in data
+    return data
@@ -0,0 +1,94 @@
+# tests/test_feature_service.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.feature_service import (
+    _group_ends,
+    _grouped_rolling_moments,
+    add_price_features,
+)
+
+
+def _random_groups(rng, kind):
+    """
+    (group keys, values) for several contiguous groups of random length
+    (a 1-row group included), with NaN gaps. `kind` picks the values:
+    continuous noise, few distinct values (ties), or long flat runs.
+    """
+    lengths = [1, *rng.integers(2, 60, size=5)]
+    keys = np.repeat(np.arange(len(lengths)), lengths)
+    n = len(keys)
+    if kind == "noise":
+        values = rng.standard_normal(n) * 10.0 ** rng.integers(-3, 7)
+    elif kind == "ties":
+        values = rng.integers(0, 3, size=n).astype(float)
+    else:  # flat runs of a large level (volume-like), so rounding shows
+        levels = rng.integers(1, 5, size=n) * 1e6
+        values = np.repeat(levels, rng.integers(1, 12, size=n))[:n]
+    values[rng.random(n) < 0.15] = np.nan
+    return keys, values
+
+
+@pytest.mark.parametrize("kind", ["noise", "ties", "flat"])
+@pytest.mark.parametrize("window", [1, 2, 5, 21])
+def test_F1_grouped_rolling_moments_match_pandas(kind, window):
+    """
+    F1: the numba kernel matches pandas groupby-rolling mean / std
+    (min_periods=1, ddof=1) on random data, including NaN gaps, ties and
+    flat windows (std exactly 0 there, as in pandas).
+    """
+    rng = np.random.default_rng(window * 100 + len(kind))
+    for _ in range(20):
+        keys, values = _random_groups(rng, kind)
+
+        mean, std = _grouped_rolling_moments(
+            values, _group_ends(pd.Series(keys)), window
+        )
+
+        rolling = pd.Series(values).groupby(keys).rolling(window, min_periods=1)
+        exp_mean = rolling.mean().to_numpy()
+        exp_std = rolling.std().to_numpy()
+        scale = np.nanmax(np.abs(values), initial=1.0)
+        np.testing.assert_allclose(mean, exp_mean, rtol=1e-9, atol=1e-12 * scale)
+        np.testing.assert_allclose(std, exp_std, rtol=1e-7, atol=1e-9 * scale)
+        # identical windows give an exact zero, not rounding noise
+        assert np.array_equal(std == 0.0, exp_std == 0.0)
+
+
+def test_F2_add_price_features_volatility_matches_pandas():
+    """
+    F2: vol_5d / vol_21d / volume_z from add_price_features equal the
+    per-ticker pandas rolling computations.
+    """
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2025-01-01", periods=40)
+    frames = []
+    for ticker in ("MSFT", "AAPL"):
+        frames.append(
+            pd.DataFrame(
+                {
+                    "ticker": ticker,
+                    "date": dates,
+                    "Close": 100 + rng.standard_normal(len(dates)).cumsum(),
+                    "Volume": rng.integers(1_000, 1_005, len(dates)).astype(float),
+                }
+            )
+        )
+    out = add_price_features(pd.concat(frames, ignore_index=True))
+
+    by_ticker = out.groupby("ticker", sort=False)
+    ret = by_ticker["Close"].pct_change(fill_method=None)
+    for col, window in (("vol_5d", 5), ("vol_21d", 21)):
+        expected = ret.groupby(out["ticker"]).transform(
+            lambda s: s.rolling(window, min_periods=1).std()
+        )
+        np.testing.assert_allclose(out[col], expected, rtol=1e-9)
+
+    vol = by_ticker["Volume"]
+    vol_mean = vol.transform(lambda s: s.rolling(21, min_periods=1).mean())
+    vol_std = vol.transform(lambda s: s.rolling(21, min_periods=1).std())
+    z = (out["Volume"] - vol_mean) / vol_std
+    expected_z = z.replace([np.inf, -np.inf], np.nan).fillna(0.0)
+    np.testing.assert_allclose(out["volume_z"], expected_z, rtol=1e-9, atol=1e-12)
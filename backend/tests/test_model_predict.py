@@ -1,68 +1,57 @@
 # tests/test_model_predict.py
 
-from fastapi.testclient import TestClient
-from app.services import model_service
+import asyncio
 
+import numpy as np
+from fastapi.testclient import TestClient
+from httpx import AsyncClient
+from app.services import model_service, predict_batcher
 
-def train_for_predict(client: TestClient):
-    """Helper: train a model we can use for predict tests."""
-    payload = {
-        "tickers": ["AAPL"],
-        "start_date": "2025-11-01",
-        "end_date": "2025-12-04",
-    }
-    resp = client.post("/api/v1/model/train", json=payload)
-    assert resp.status_code == 200
+from helpers import assert_detail, body
 
 
-def test_P1_predict_after_train(client: TestClient):
+def test_P1_predict_after_train(trained_client: TestClient):
     """
     P1: train first, then call /predict-next -> 200 + prob_up in [0,1].
     """
-    train_for_predict(client)
-
-    resp = client.post(
+    resp = trained_client.post(
         "/api/v1/model/predict-next",
         json={"ticker": "AAPL"},
     )
     assert resp.status_code == 200
-    data = resp.json()
+    data = body(resp)
 
     assert data["ticker"] == "AAPL"
     assert 0.0 <= data["prob_up"] <= 1.0
 
 
-def test_P2_predict_without_train(client: TestClient, monkeypatch):
+def test_P2_predict_without_train(client: TestClient, monkeypatch, tmp_path):
     """
     P2: model not trained in this process -> 400 with proper error message.
-    We forcibly reset _GLOBAL_MODEL and _LAST_TRAIN_DF.
+    We reset the model globals for this test only (monkeypatch restores them,
+    so the shared trained model survives), and point MODEL_PATH at an empty
+    location so no persisted model is picked up either.
     """
-    # force reset global state
-    model_service._GLOBAL_MODEL = None
-    model_service._LAST_TRAIN_DF = None
+    monkeypatch.setattr(model_service, "_GLOBAL_MODEL", None)
+    monkeypatch.setattr(model_service, "_LAST_TRAIN_DF", None)
+    monkeypatch.setattr(model_service, "MODEL_PATH", str(tmp_path / "model.joblib"))
 
     resp = client.post(
         "/api/v1/model/predict-next",
         json={"ticker": "AAPL"},
     )
-    assert resp.status_code == 400
-    data = resp.json()
-    assert "Model has not been trained yet" in data["detail"]
+    assert_detail(resp, 400, b"Model has not been trained yet")
 
 
-def test_P3_predict_for_unknown_ticker(client: TestClient):
+def test_P3_predict_for_unknown_ticker(trained_client: TestClient):
     """
     P3: train only on AAPL, then predict for MSFT -> 400 'No training samples found'.
     """
-    train_for_predict(client)
-
-    resp = client.post(
+    resp = trained_client.post(
         "/api/v1/model/predict-next",
         json={"ticker": "MSFT"},
     )
-    assert resp.status_code == 400
-    data = resp.json()
-    assert "No training samples found for ticker 'MSFT'" in data["detail"]
+    assert_detail(resp, 400, b"No training samples found for ticker 'MSFT'")
 
 
 def test_P4_predict_invalid_body(client: TestClient):
@@ -71,5 +60,67 @@ def test_P4_predict_invalid_body(client: TestClient):
     """
     resp = client.post("/api/v1/model/predict-next", json={})
     assert resp.status_code == 422
-    data = resp.json()
+    data = body(resp)
     assert data["detail"][0]["loc"] == ["body", "ticker"]
+
+
+class _CountingClassifier:
+    """Stand-in model that records every predict_proba batch it gets."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_proba(self, X):
+        self.batch_sizes.append(len(X))
+        return np.column_stack([np.full(len(X), 0.75), np.full(len(X), 0.25)])
+
+
+async def test_P5_concurrent_predicts_share_one_batch(
+    async_client: AsyncClient, monkeypatch
+):
+    """
+    P5: predicts arriving together -> one predict_proba call for all of them.
+    """
+    clf = _CountingClassifier()
+    rows = {t: np.zeros((1, 1), dtype=np.float32) for t in ("AAPL", "MSFT", "NVDA")}
+    monkeypatch.setattr(model_service, "_GLOBAL_MODEL", (clf, ["ret_1d"], rows))
+    # wide window so every request joins the batch even on a slow machine
+    monkeypatch.setattr(predict_batcher, "BATCH_WINDOW_S", 0.2)
+
+    tickers = ["AAPL", "MSFT", "NVDA", "AAPL", "MSFT", "NVDA"]
+    resps = await asyncio.gather(
+        *[
+            async_client.post("/api/v1/model/predict-next", json={"ticker": t})
+            for t in tickers
+        ]
+    )
+
+    assert [r.status_code for r in resps] == [200] * len(tickers)
+    assert [body(r)["ticker"] for r in resps] == tickers
+    assert all(body(r)["prob_up"] == 0.25 for r in resps)
+    assert clf.batch_sizes == [len(tickers)]
+
+
+async def test_P6_failed_batch_fails_every_request(monkeypatch):
+    """
+    P6: a batch that can't be stacked (rows of different widths) -> every
+    request in it gets the error instead of waiting forever.
+    """
+    rows = {
+        "AAPL": np.zeros((1, 1), dtype=np.float32),
+        "MSFT": np.zeros((1, 2), dtype=np.float32),
+    }
+    monkeypatch.setattr(
+        model_service, "_GLOBAL_MODEL", (_CountingClassifier(), ["ret_1d"], rows)
+    )
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            predict_batcher.predict_next("AAPL"),
+            predict_batcher.predict_next("MSFT"),
+            return_exceptions=True,
+        ),
+        timeout=5,
+    )
+
+    assert all(isinstance(r, ValueError) for r in results), results
@@ -1,191 +1,203 @@
 # tests/test_model_train.py
 
-from fastapi.testclient import TestClient
-
-
-def test_T2_small_range_not_enough_rows(client: TestClient):
-    """
-    T2: start_date == end_date -> too few rows -> 400 with clear message.
-    """
-    payload = {
-        "tickers": ["AAPL"],
-        "start_date": "2025-12-04",
-        "end_date": "2025-12-04",
+import asyncio
+from types import MappingProxyType
+
+import pytest
+from httpx import AsyncClient
+from pydantic import ValidationError
+
+from app.api.routes_sentiment import TrainRequest
+from helpers import AAPL_LARGE_WINDOW, assert_detail, assert_trained, body
+
+# Request payloads, built once (read-only; see helpers.AAPL_LARGE_WINDOW)
+_AAPL_SMALL = MappingProxyType(
+    {"tickers": ("AAPL",), "start_date": "2025-12-01", "end_date": "2025-12-04"}
+)
+_AAPL_MSFT = MappingProxyType(
+    {"tickers": ("AAPL", "MSFT"), "start_date": "2025-11-01", "end_date": "2025-12-04"}
+)
+_BAD_DATE_FORMAT = MappingProxyType(
+    {
+        "tickers": ("AAPL",),
+        "start_date": "11-01-2025",   # wrong format
+        "end_date": "2025/12/04",     # wrong separator
     }
-    resp = client.post("/api/v1/model/train", json=payload)
-    # After your try/except this should be 400, not 500
-    assert resp.status_code == 400
-    data = resp.json()
-    assert "Not enough rows" in data["detail"]
-
-
-def test_T3_small_window_ok(client: TestClient):
+)
+
+
+# (read-only payload, expected substring of the 400 detail) for the validation
+# and no-data error cases; the details are ASCII, so they're matched as bytes
+# in the raw response body without decoding the JSON
+TRAIN_400_CASES = (
+    pytest.param(
+        # start_date == end_date -> too few rows
+        MappingProxyType(
+            {
+                "tickers": ("AAPL",),
+                "start_date": "2025-12-04",
+                "end_date": "2025-12-04",
+            }
+        ),
+        b"Not enough rows",
+        id="T2_small_range_not_enough_rows",
+    ),
+    pytest.param(
+        # bogus ticker -> yfinance returns empty
+        MappingProxyType(
+            {
+                "tickers": ("THIS_TICKER_DOES_NOT_EXIST_123",),
+                "start_date": "2025-11-01",
+                "end_date": "2025-11-10",
+            }
+        ),
+        b"No price data returned for given tickers",
+        id="T4_invalid_ticker_no_price_data",
+    ),
+    pytest.param(
+        # very future dates where AAPL has no prices
+        MappingProxyType(
+            {
+                "tickers": ("AAPL",),
+                "start_date": "2099-01-01",
+                "end_date": "2099-01-10",
+            }
+        ),
+        b"No price data returned for given tickers",
+        id="T5_future_dates_no_price_data",
+    ),
+    pytest.param(
+        # tickers=[] on the wire
+        MappingProxyType(
+            {
+                "tickers": (),
+                "start_date": "2025-11-01",
+                "end_date": "2025-12-04",
+            }
+        ),
+        b"At least one ticker is required",
+        id="T6_missing_tickers_empty_list",
+    ),
+    pytest.param(
+        # no 'ticker' or 'tickers' fields at all
+        MappingProxyType(
+            {
+                "start_date": "2025-11-01",
+                "end_date": "2025-12-04",
+            }
+        ),
+        b"At least one ticker is required",
+        id="T7_missing_ticker_fields_entirely",
+    ),
+    pytest.param(
+        # start_date > end_date
+        MappingProxyType(
+            {
+                "tickers": ("AAPL",),
+                "start_date": "2025-12-04",
+                "end_date": "2025-11-01",
+            }
+        ),
+        b"start_date must be before end_date",
+        id="T9_start_after_end",
+    ),
+)
+
+
+@pytest.mark.parametrize("payload,expected", TRAIN_400_CASES)
+async def test_train_400(async_client: AsyncClient, payload, expected):
+    """
+    T2/T4/T5/T6/T7/T9: bad or empty requests -> 400 with a clear detail.
+    """
+    resp = await async_client.post("/api/v1/model/train", json=dict(payload))
+    assert_detail(resp, 400, expected)
+
+
+async def test_T_batch_errors(async_client: AsyncClient):
+    """
+    The TRAIN_400_CASES sent concurrently -> each still gets its own 400.
+    """
+    resps = await asyncio.gather(
+        *[
+            async_client.post("/api/v1/model/train", json=dict(case.values[0]))
+            for case in TRAIN_400_CASES
+        ]
+    )
+    for case, resp in zip(TRAIN_400_CASES, resps):
+        assert_detail(resp, 400, case.values[1])
+
+
+async def test_T3_small_window_ok(async_client: AsyncClient):
     """
     T3: small but valid window (a few days), training should succeed.
     """
-    payload = {
-        "tickers": ["AAPL"],
-        "start_date": "2025-12-01",
-        "end_date": "2025-12-04",
-    }
-    resp = client.post("/api/v1/model/train", json=payload)
-    assert resp.status_code == 200
-    data = resp.json()
-
-    assert data["message"] == "Training completed"
-    assert data["tickers"] == ["AAPL"]
-    assert data["train_rows"] >= 1
-    assert data["price_rows"] >= data["train_rows"]
-    # roc_auc may be None if only one class in y_test
-    assert "roc_auc" in data
-
-
-def test_T4_invalid_ticker_no_price_data(client: TestClient):
-    """
-    T4: bogus ticker -> yfinance returns empty -> 400 with 'No price data' detail.
-    """
-    payload = {
-        "tickers": ["THIS_TICKER_DOES_NOT_EXIST_123"],
-        "start_date": "2025-11-01",
-        "end_date": "2025-11-10",
-    }
-    resp = client.post("/api/v1/model/train", json=payload)
-    assert resp.status_code == 400
-    data = resp.json()
-    assert data["detail"].startswith("No price data returned for given tickers")
-
-
-def test_T5_future_dates_no_price_data(client: TestClient):
-    """
-    T5: very future dates where AAPL has no prices -> 400 + no price data.
-    """
-    payload = {
-        "tickers": ["AAPL"],
-        "start_date": "2099-01-01",
-        "end_date": "2099-01-10",
-    }
-    resp = client.post("/api/v1/model/train", json=payload)
-    assert resp.status_code == 400
-    data = resp.json()
-    assert data["detail"].startswith("No price data returned for given tickers")
+    resp = await async_client.post("/api/v1/model/train", json=dict(_AAPL_SMALL))
+    assert_trained(resp, ["AAPL"])
 
 
-def test_T6_missing_tickers_empty_list(client: TestClient):
+def test_T8_invalid_date_format():
     """
-    T6: tickers=[] or only empty strings -> 400 'At least one ticker is required'.
-    """
-    payload = {
-        "tickers": [],
-        "start_date": "2025-11-01",
-        "end_date": "2025-12-04",
-    }
-    resp = client.post("/api/v1/model/train", json=payload)
-    assert resp.status_code == 400
-    data = resp.json()
-    assert "At least one ticker is required" in data["detail"]
-
-
-def test_T7_missing_ticker_fields_entirely(client: TestClient):
-    """
-    T7: no 'ticker' or 'tickers' fields at all -> same 400 error.
-    """
-    payload = {
-        "start_date": "2025-11-01",
-        "end_date": "2025-12-04",
-    }
-    resp = client.post("/api/v1/model/train", json=payload)
-    assert resp.status_code == 400
-    data = resp.json()
-    assert "At least one ticker is required" in data["detail"]
-
-
-def test_T8_invalid_date_format(client: TestClient):
-    """
-    T8: invalid date strings -> Pydantic validation error (422).
+    T8: invalid date strings -> Pydantic validation error (the route's 422).
     Matches the error you saw for '11-01-2025' and '2025/12/04'.
+    Validates TrainRequest directly; FastAPI turns this error into the 422.
     """
-    payload = {
-        "tickers": ["AAPL"],
-        "start_date": "11-01-2025",   # wrong format
-        "end_date": "2025/12/04",     # wrong separator
-    }
-    resp = client.post("/api/v1/model/train", json=payload)
-    assert resp.status_code == 422
-    data = resp.json()
+    with pytest.raises(ValidationError) as exc_info:
+        TrainRequest.model_validate(_BAD_DATE_FORMAT)
     # Just sanity check we got validation issues for both fields
-    locs = [err["loc"] for err in data["detail"]]
-    assert ["body", "start_date"] in locs
-    assert ["body", "end_date"] in locs
+    locs = [err["loc"] for err in exc_info.value.errors()]
+    assert ("start_date",) in locs
+    assert ("end_date",) in locs
 
 
-def test_T9_start_after_end(client: TestClient):
-    """
-    T9: start_date > end_date -> 400 'start_date must be before end_date'.
-    """
-    payload = {
-        "tickers": ["AAPL"],
-        "start_date": "2025-12-04",
-        "end_date": "2025-11-01",
-    }
-    resp = client.post("/api/v1/model/train", json=payload)
-    assert resp.status_code == 400
-    data = resp.json()
-    assert data["detail"] == "start_date must be before end_date"
-
-
-def test_T10_large_window_train_success(client: TestClient):
+def test_T10_large_window_train_success(large_window_train):
     """
     T10: bigger window (like your example) -> success, >=2 rows, roc_auc present.
     """
-    payload = {
-        "tickers": ["AAPL"],
-        "start_date": "2025-11-01",
-        "end_date": "2025-12-04",
-    }
-    resp = client.post("/api/v1/model/train", json=payload)
-    assert resp.status_code == 200
-    data = resp.json()
-
-    assert data["message"] == "Training completed"
-    assert data["tickers"] == ["AAPL"]
-    assert data["train_rows"] >= 2
-    assert data["price_rows"] >= data["train_rows"]
-    assert "roc_auc" in data
+    assert_trained(large_window_train, ["AAPL"], min_rows=2)
 
 
-def test_T11_large_window_again_idempotent(client: TestClient):
+async def test_T11_large_window_again_idempotent(
+    async_client: AsyncClient, large_window_train
+):
     """
-    T11: same as T10 to ensure it stays stable (idempotent-ish).
+    T11: same request as T10 again -> identical response (idempotent).
     """
-    payload = {
-        "tickers": ["AAPL"],
-        "start_date": "2025-11-01",
-        "end_date": "2025-12-04",
-    }
-    resp = client.post("/api/v1/model/train", json=payload)
+    resp = await async_client.post("/api/v1/model/train", json=dict(AAPL_LARGE_WINDOW))
     assert resp.status_code == 200
-    data = resp.json()
-
-    assert data["message"] == "Training completed"
-    assert data["tickers"] == ["AAPL"]
-    assert data["train_rows"] >= 2
-    assert data["price_rows"] >= data["train_rows"]
+    assert body(resp) == body(large_window_train)
 
 
-def test_T12_multi_ticker_train(client: TestClient):
+async def test_T12_multi_ticker_train(async_client: AsyncClient, yf_calls):
     """
     T12: multi-ticker request. Previously crashed in add_price_features,
-    now should succeed after the 'ret_1d' bug fix.
-    """
-    payload = {
-        "tickers": ["AAPL", "MSFT"],
-        "start_date": "2025-11-01",
-        "end_date": "2025-12-04",
+    now should succeed after the 'ret_1d' bug fix. Prices for both tickers
+    come from a single batched yf.download call.
+    """
+    resp = await async_client.post("/api/v1/model/train", json=dict(_AAPL_MSFT))
+    assert_trained(resp, ["AAPL", "MSFT"], min_rows=2)
+
+    assert len(yf_calls) == 1
+    assert set(yf_calls[0]) == {"AAPL", "MSFT"}
+
+
+@pytest.mark.parametrize(
+    "path,method,status,schema",
+    [
+        ("/api/v1/model/train", "post", "200", "TrainResponse"),
+        ("/api/v1/model/train/jobs", "post", "202", "TrainJobAccepted"),
+        ("/api/v1/model/train/status/{job_id}", "get", "200", "TrainJobStatus"),
+        ("/api/v1/model/predict-next", "post", "200", "PredictResponse"),
+    ],
+)
+async def test_T13_response_models_in_openapi(
+    async_client: AsyncClient, path, method, status, schema
+):
+    """
+    T13: the model routes declare their response bodies, so they show up in
+    the OpenAPI schema.
+    """
+    resp = await async_client.get("/openapi.json")
+    responses = body(resp)["paths"][path][method]["responses"]
+    assert responses[status]["content"]["application/json"]["schema"] == {
+        "$ref": f"#/components/schemas/{schema}"
     }
-    resp = client.post("/api/v1/model/train", json=payload)
-    assert resp.status_code == 200
-    data = resp.json()
-
-    assert data["message"] == "Training completed"
-    assert set(data["tickers"]) == {"AAPL", "MSFT"}
-    assert data["train_rows"] >= 2
\ No newline at end of file
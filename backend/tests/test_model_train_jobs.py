@@ -0,0 +1,76 @@
+# tests/test_model_train_jobs.py
+
+import time
+
+from fastapi.testclient import TestClient
+
+from helpers import AAPL_LARGE_WINDOW, assert_detail, body
+
+
+def _submit_and_wait(client: TestClient, payload, timeout=30.0):
+    """Submit a training job, poll it until it finishes; returns the record."""
+    resp = client.post("/api/v1/model/train/jobs", json=payload)
+    assert resp.status_code == 202
+    job_id = body(resp)["job_id"]
+
+    deadline = time.monotonic() + timeout
+    while True:
+        resp = client.get(f"/api/v1/model/train/status/{job_id}")
+        assert resp.status_code == 200
+        job = body(resp)
+        if job["status"] in ("completed", "failed"):
+            return job
+        assert time.monotonic() < deadline, f"job still {job['status']}"
+        time.sleep(0.05)
+
+
+def test_J1_submit_job_validates_like_train(client: TestClient):
+    """
+    J1: /model/train/jobs runs the same validation as /model/train -> 400.
+    """
+    payload = {
+        "tickers": ["AAPL"],
+        "start_date": "2025-12-04",
+        "end_date": "2025-11-01",
+    }
+    resp = client.post("/api/v1/model/train/jobs", json=payload)
+    assert_detail(resp, 400, b"start_date must be before end_date")
+
+
+def test_J2_unknown_job_status(client: TestClient):
+    """
+    J2: polling an unknown job id -> 404.
+    """
+    resp = client.get("/api/v1/model/train/status/does-not-exist")
+    assert_detail(resp, 404, b"Unknown training job")
+
+
+def test_J3_job_runs_to_completed(client: TestClient):
+    """
+    J3: a valid job is polled from queued/running to completed, with the
+    /model/train response as its result.
+    """
+    job = _submit_and_wait(client, dict(AAPL_LARGE_WINDOW))
+
+    assert job["status"] == "completed"
+    assert job["error"] is None
+    assert job["result"]["message"] == "Training completed"
+    assert job["result"]["tickers"] == ["AAPL"]
+
+
+def test_J4_job_runs_to_failed(client: TestClient):
+    """
+    J4: a job whose training finds no prices ends as failed with the error.
+    """
+    job = _submit_and_wait(
+        client,
+        {
+            "tickers": ["THIS_TICKER_DOES_NOT_EXIST_123"],
+            "start_date": "2025-11-01",
+            "end_date": "2025-11-10",
+        },
+    )
+
+    assert job["status"] == "failed"
+    assert job["result"] is None
+    assert job["error"].startswith("No price data returned for given tickers")
@@ -0,0 +1,290 @@
+# tests/test_sentiment_services.py
+
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+from cachetools import TTLCache
+
+from app.services import http_client, news_service, sentiment_service, twitter_service
+
+_TW_COLS = ["tw_sent_mean", "tw_sent_std", "tw_count", "tw_pos_share", "tw_neg_share"]
+_NEWS_COLS = [
+    "news_sent_mean", "news_sent_std", "news_count", "news_pos_share", "news_neg_share",
+]
+
+
+@pytest.fixture
+def mock_apis(monkeypatch):
+    """
+    Route the services' outbound calls to a handler(request) -> httpx.Response
+    that the test installs with mock_apis(handler). Sets dummy API keys and
+    starts from empty response caches.
+    """
+    monkeypatch.setattr(news_service, "NEWSAPI_KEY", "test-newsapi")
+    monkeypatch.setattr(news_service, "MEDIASTACK_KEY", "test-mediastack")
+    monkeypatch.setattr(twitter_service, "TWITTER_BEARER_TOKEN", "test-twitter")
+    monkeypatch.setattr(news_service, "_NEWS_CACHE", TTLCache(maxsize=1024, ttl=3600))
+    monkeypatch.setattr(
+        twitter_service, "_TWITTER_CACHE", TTLCache(maxsize=1024, ttl=600)
+    )
+
+    def install(handler):
+        @asynccontextmanager
+        async def client():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as c:
+                yield c
+
+        monkeypatch.setattr(http_client, "client", client)
+
+    return install
+
+
+def _json(payload, status=200):
+    return httpx.Response(status, json=payload)
+
+
+def _reference_daily(raw: pd.DataFrame, prefix: str, ddof: int) -> pd.DataFrame:
+    """Daily aggregates of raw (ticker, date, sentiment) via a plain groupby."""
+    g = raw.assign(
+        pos=raw["sentiment"] > 0, neg=raw["sentiment"] < 0
+    ).groupby(["ticker", "date"])
+    return pd.DataFrame(
+        {
+            f"{prefix}_sent_mean": g["sentiment"].mean(),
+            f"{prefix}_sent_std": g["sentiment"].std(ddof=ddof),
+            f"{prefix}_count": g["sentiment"].count(),
+            f"{prefix}_pos_share": g["pos"].mean(),
+            f"{prefix}_neg_share": g["neg"].mean(),
+        }
+    ).reset_index()
+
+
+def _by_key(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values(["ticker", "date"]).reset_index(drop=True)
+
+
+# ---------- twitter_service ----------
+
+def test_W1_twitter_daily_aggregates_match_groupby(mock_apis):
+    """
+    W1: the numba daily kernel matches a pandas groupby (mean, ddof=0 std,
+    count, pos/neg shares); tweets are scored on whole words only.
+    """
+    now = datetime.now(timezone.utc)
+    # (created_at, text, expected score)
+    tweets = {
+        "AAPL": [
+            (now - timedelta(days=2, hours=1), "great gains today", 1.0),
+            (now - timedelta(days=2, hours=2), "bad quarter, bearish", -1.0),
+            (now - timedelta(days=2, hours=3), "upbeat chatter", 0.0),
+            (now - timedelta(days=1, hours=1), "Bullish and green", 1.0),
+        ],
+        "MSFT": [
+            (now - timedelta(days=1, hours=2), "losses, down big", -1.0),
+            (now - timedelta(days=1, hours=3), "up up up, then down", 1.0),
+            (now - timedelta(days=1, hours=4), "sideways", 0.0),
+        ],
+    }
+
+    def handler(request):
+        ticker = "AAPL" if "AAPL" in request.url.params["query"] else "MSFT"
+        return _json(
+            {
+                "data": [
+                    {"created_at": ts.isoformat().replace("+00:00", "Z"), "text": text}
+                    for ts, text, _ in tweets[ticker]
+                ]
+            }
+        )
+
+    mock_apis(handler)
+    start = (now - timedelta(days=3)).date()
+    out = twitter_service.fetch_twitter(["AAPL", "MSFT"], start, now.date())
+
+    raw = pd.DataFrame(
+        [
+            (t, pd.Timestamp(ts).tz_localize(None).normalize(), score)
+            for t, rows in tweets.items()
+            for ts, _, score in rows
+        ],
+        columns=["ticker", "date", "sentiment"],
+    )
+    expected = _reference_daily(raw, "tw", ddof=0)
+
+    assert list(out.columns) == ["ticker", "date", *_TW_COLS]
+    pd.testing.assert_frame_equal(
+        _by_key(out), _by_key(expected), check_dtype=False, rtol=1e-6
+    )
+
+
+def test_W2_twitter_missing_timestamp_and_failed_ticker(mock_apis):
+    """
+    W2: a tweet without created_at falls on today's UTC date; a ticker whose
+    request fails is dropped without losing the others.
+    """
+
+    def handler(request):
+        if "MSFT" in request.url.params["query"]:
+            raise httpx.ConnectError("boom", request=request)
+        return _json({"data": [{"text": "great"}]})
+
+    mock_apis(handler)
+    before = pd.Timestamp(datetime.now(timezone.utc).date())
+    out = twitter_service.fetch_twitter(
+        ["AAPL", "MSFT"], before.date() - timedelta(days=1), before.date()
+    )
+    after = pd.Timestamp(datetime.now(timezone.utc).date())
+
+    assert out["ticker"].tolist() == ["AAPL"]
+    assert before <= out["date"].iloc[0] <= after
+    assert out["tw_count"].iloc[0] == 1
+    assert out["tw_sent_mean"].iloc[0] == 1.0
+
+
+# ---------- news_service ----------
+
+_START = date(2025, 11, 3)
+_END = date(2025, 11, 5)
+
+
+async def test_N1_news_scoring_window_and_fallback(mock_apis):
+    """
+    N1: whole-word scoring, sample-std daily aggregates, articles outside
+    [start, end] dropped, and a missing publishedAt dated to `start`.
+    """
+    newsapi_articles = [
+        # +2 / -0 -> 1.0
+        {"title": "Shares surge", "description": "Upgraded to buy",
+         "publishedAt": "2025-11-04T14:00:00Z"},
+        # +2 (up, profits) / -1 (down) -> 1/3
+        {"title": "Shares up", "description": "profits down on costs",
+         "publishedAt": "2025-11-04T20:30:00Z"},
+        # no whole-word hits ('uptown', 'downgrades' are not in the lexicon)
+        {"title": "Uptown store", "description": "downgrades nothing",
+         "publishedAt": "2025-11-05T09:00:00Z"},
+        # outside the window on both sides -> dropped
+        {"title": "Record rally", "description": None,
+         "publishedAt": "2025-10-30T09:00:00Z"},
+        {"title": "Weak", "description": "", "publishedAt": "2025-11-06T01:00:00Z"},
+        # no timestamp -> dated to start
+        {"title": "Lawsuit filed", "description": "stock falls"},
+    ]
+    mediastack_articles = [
+        {"title": "Downgrade", "description": "",
+         "published_at": "2025-11-04T10:00:00+00:00"},
+    ]
+
+    def handler(request):
+        if request.url.host == "newsapi.org":
+            return _json({"status": "ok", "articles": newsapi_articles})
+        return _json({"data": mediastack_articles})
+
+    mock_apis(handler)
+    out = await news_service.fetch_news_for_tickers(["AAPL"], _START, _END)
+
+    raw = pd.DataFrame(
+        {
+            "ticker": "AAPL",
+            "date": pd.to_datetime(
+                ["2025-11-04", "2025-11-04", "2025-11-05", "2025-11-03", "2025-11-04"]
+            ),
+            "sentiment": np.array([1.0, 1 / 3, 0.0, -1.0, -1.0], dtype=np.float32),
+        }
+    )
+    expected = _reference_daily(raw, "news", ddof=1)
+
+    assert list(out.columns) == ["ticker", "date", *_NEWS_COLS]
+    pd.testing.assert_frame_equal(
+        _by_key(out), _by_key(expected), check_dtype=False, rtol=1e-6
+    )
+
+
+async def test_N2_news_provider_errors_are_isolated(mock_apis):
+    """
+    N2: a provider that fails (connection error or non-200) costs only its
+    own articles; the other provider's still come through.
+    """
+
+    def handler(request):
+        if request.url.host == "api.mediastack.com":
+            raise httpx.ConnectError("boom", request=request)
+        if "MSFT" in request.url.params["q"]:
+            return _json({"status": "error"}, status=500)
+        return _json(
+            {
+                "status": "ok",
+                "articles": [
+                    {"title": "Strong growth", "publishedAt": "2025-11-04T12:00:00Z"}
+                ],
+            }
+        )
+
+    mock_apis(handler)
+    out = await news_service.fetch_news_for_tickers(["AAPL", "MSFT"], _START, _END)
+
+    assert out[["ticker", "date", "news_count", "news_sent_mean"]].to_dict(
+        "records"
+    ) == [
+        {
+            "ticker": "AAPL",
+            "date": pd.Timestamp("2025-11-04"),
+            "news_count": 1,
+            "news_sent_mean": 1.0,
+        }
+    ]
+
+
+# ---------- sentiment_service ----------
+
+def test_B1_build_training_frame_merges_news(mock_apis, monkeypatch):
+    """
+    B1: build_training_frame (sync, runs the fetchers under asyncio.run)
+    merges daily news onto matching price rows on categorical ticker /
+    datetime64 date keys, and a failing twitter fetch doesn't stop it.
+    """
+
+    articles = [
+        {"title": "Record profit", "publishedAt": "2025-11-04T12:00:00Z"},
+        {"title": "Big loss", "publishedAt": "2025-11-04T13:00:00Z"},
+    ]
+
+    def handler(request):
+        if request.url.host == "newsapi.org" and "AAPL" in request.url.params["q"]:
+            return _json({"status": "ok", "articles": articles})
+        return _json({"status": "ok", "articles": [], "data": []})
+
+    async def twitter_down(tickers, start, end):
+        raise RuntimeError("twitter down")
+
+    mock_apis(handler)
+    monkeypatch.setattr(sentiment_service, "fetch_twitter_for_tickers", twitter_down)
+
+    days = pd.date_range("2025-11-03", "2025-11-07", freq="B")
+    prices = pd.DataFrame(
+        {
+            "ticker": ["AAPL"] * len(days) + ["MSFT"] * len(days),
+            "date": list(days) * 2,
+            "Close": np.arange(2 * len(days), dtype=float),
+        }
+    )
+    out = sentiment_service.build_training_frame(
+        prices, ["AAPL", "MSFT"], _START, date(2025, 11, 7)
+    )
+
+    assert isinstance(out["ticker"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(out["date"])
+    assert not any(c.startswith("tw_") for c in out.columns)
+    # left merges: every price row is kept, with or without news
+    assert len(out) == len(prices)
+
+    merged = out.dropna(subset=["news_count"])
+    assert merged[["ticker", "date"]].astype({"ticker": str}).to_dict("records") == [
+        {"ticker": "AAPL", "date": pd.Timestamp("2025-11-04")}
+    ]
+    assert merged["news_count"].iloc[0] == 2
+    assert merged["news_sent_mean"].iloc[0] == 0.0
+    assert merged["news_pos_share"].iloc[0] == 0.5
@@ -1,20 +1,30 @@
 # tests/test_stocks_popular.py
 
+import pytest
 from fastapi.testclient import TestClient
 
+from helpers import body
 
-def test_S1_popular_stocks(client: TestClient):
+# Symbols that must always be in the popular list
+_EXPECTED_SYMBOLS = frozenset({"AAPL", "MSFT", "AMZN", "TSLA"})
+
+
+@pytest.fixture(scope="session")
+def popular(client: TestClient):
+    """The /stocks/popular response, fetched once (the list is static)."""
+    return client.get("/api/v1/stocks/popular")
+
+
+def test_S1_popular_stocks(popular):
     """
     S1: /api/v1/stocks/popular returns a list of known symbols.
     """
-    resp = client.get("/api/v1/stocks/popular")
-    assert resp.status_code == 200
+    assert popular.status_code == 200
 
-    data = resp.json()
+    data = body(popular)
     assert isinstance(data, list)
     assert len(data) >= 5
 
     # Make sure some of your expected symbols are present
     symbols = {item["symbol"] for item in data}
-    for sym in ["AAPL", "MSFT", "AMZN", "TSLA"]:
-        assert sym in symbols
+    assert _EXPECTED_SYMBOLS <= symbols, _EXPECTED_SYMBOLS - symbols